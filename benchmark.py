@@ -0,0 +1,145 @@
+"""Frame-cost benchmark for every level, run under SDL's dummy video driver.
+
+Each level is played along a scripted path from the start to the goal with
+worst-case effects forced on (full decay and glitch, full static, several
+death chunks). Frame-time percentiles are reported per level as JSON.
+
+    python benchmark.py                      # print the report
+    python benchmark.py --save-baseline      # store it as the baseline
+    python benchmark.py --baseline FILE      # fail on regressions against FILE
+
+Frame times depend on the machine, so the default baseline is local and
+not committed; without one a plain run only warns that nothing was compared.
+"""
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import argparse
+import json
+import sys
+import time
+
+import pygame
+
+import game
+
+DEFAULT_BASELINE = os.path.join(game.BASE_DIR, 'bench_baseline.json')
+BENCH_SEED = 1234
+BENCH_DEATH_CHUNKS = 6
+
+def rail_y(session, x):
+    # Stand on the highest platform under the player, like a perfect run would
+    player = session.player
+    tops = [p.data['y'] for p in session.geometry.platforms_near(x, x + player.width)]
+    return min(tops) - player.height if tops else player.y
+
+def force_worst_case(session):
+    session.decay_factor = 1.0
+    session.glitch_intensity = 1.0
+    session.static_intensity = 1.0
+    session.player.lives = 3
+
+def run_level(screen, level_num, font, small_font):
+    session = game.GameSession(level_num, seed=BENCH_SEED)
+    session.death_chunks = game.DeathChunkOverlay(lifetime_ms=None)
+    for i in range(BENCH_DEATH_CHUNKS):
+        chunk_x = 80 + i * (game.WIDTH - 260) // BENCH_DEATH_CHUNKS
+        chunk_y = 80 + (i % 3) * 180
+        session.death_chunks.add(game.DeathChunk(chunk_x, chunk_y, 180, 140))
+
+    profiler = game.FrameProfiler(capacity=100000)
+    x = session.player.x
+    start = time.perf_counter()
+    while not session.game_over:
+        profiler.begin_frame()
+        session.step(game.INPUT_RIGHT)
+        x = min(x + game.PLAYER_SPEED, session.goal.x)
+        player = session.player
+        player.x = player.prev_x = x
+        player.y = player.prev_y = rail_y(session, x)
+        force_worst_case(session)
+        profiler.mark('physics')
+
+        session.draw(screen, 1.0, profiler)
+        game.draw_hud(screen, session, font, small_font)
+        profiler.mark('hud')
+        pygame.display.flip()
+        profiler.mark('flip')
+        profiler.end_frame()
+    elapsed = time.perf_counter() - start
+
+    summary = profiler.summary()
+    return {
+        'frames': summary['frames'],
+        'fps': summary['frames'] / elapsed,
+        'p50_ms': summary['p50'],
+        'p95_ms': summary['p95'],
+        'p99_ms': summary['p99'],
+        'phases_ms': summary['phases'],
+        'reached_goal': session.won,
+    }
+
+def compare(report, baseline, tolerance):
+    regressions = []
+    for level, result in report['levels'].items():
+        previous = baseline.get('levels', {}).get(level)
+        if previous is None:
+            continue
+        limit = previous['p95_ms'] * (1 + tolerance)
+        if result['p95_ms'] > limit:
+            regressions.append(f"level {level}: p95 {result['p95_ms']:.2f}ms > {limit:.2f}ms "
+                               f"(baseline {previous['p95_ms']:.2f}ms + {tolerance:.0%})")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--levels', type=int, nargs='*', help='levels to run (default: all)')
+    parser.add_argument('--baseline', help=f'baseline JSON to compare against (default: {DEFAULT_BASELINE}, '
+                                           'which may be missing; a given file must exist)')
+    parser.add_argument('--save-baseline', action='store_true', help='write this run as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed p95 slowdown, as a fraction')
+    parser.add_argument('--output', help='also write the report to this file')
+    args = parser.parse_args(argv)
+
+    game.init_pygame()
+    screen = pygame.display.set_mode((game.WIDTH, game.HEIGHT))
+    font = game.load_font(36)
+    small_font = game.load_font(28)
+
+    levels = args.levels or sorted(game.LEVEL_CONFIG)
+    report = {'driver': os.environ.get('SDL_VIDEODRIVER'), 'levels': {}}
+    for level_num in levels:
+        report['levels'][str(level_num)] = run_level(screen, level_num, font, small_font)
+    pygame.quit()
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+
+    baseline_path = args.baseline or DEFAULT_BASELINE
+    if args.save_baseline:
+        with open(baseline_path, 'w') as f:
+            f.write(text + '\n')
+        print(f"Baseline written to {baseline_path}", file=sys.stderr)
+        return 0
+
+    if not os.path.exists(baseline_path):
+        if args.baseline:
+            print(f"Baseline {baseline_path} not found", file=sys.stderr)
+            return 2
+        print(f"WARNING no baseline at {baseline_path}, nothing compared; "
+              f"run with --save-baseline to create one", file=sys.stderr)
+        return 0
+
+    with open(baseline_path, 'r') as f:
+        regressions = compare(report, json.load(f), args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    if regressions:
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""Monte Carlo input fuzzer for every level, spread over all CPU cores.
+
+Each run plays one level headlessly with random or right-biased inputs
+until it is won, lost or out of time. Runs are grouped into batches and
+handed to a process pool; the merged report is JSON with, per level:
+win rate, death hotspots, how often each platform was landed on, runs
+that stalled, broken player state and any exceptions. Every run is
+reproducible from its level and seed.
+
+    python fuzz.py                           # 1000 runs per level
+    python fuzz.py --runs 200 --levels 2 6   # a quick pass over two levels
+"""
+import os
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import argparse
+import json
+import math
+import multiprocessing
+import random
+import sys
+import time
+import traceback
+from collections import Counter
+
+import game
+
+POLICIES = ['random', 'biased']
+BATCH_SIZE = 25
+DEATH_BUCKET = 50  # px; deaths are counted per bucket of x
+STALL_TICKS = 10 * game.SIM_RATE  # no forward progress this long while pushing right
+MAX_HOLD_TICKS = 30
+
+def next_inputs(rng, policy):
+    """Inputs to hold and for how many ticks"""
+    if policy == 'random':
+        return rng.randrange(8), rng.randint(1, MAX_HOLD_TICKS)
+    # Mostly run right, jumping often, with the odd step back
+    inputs = game.INPUT_LEFT if rng.random() < 0.1 else game.INPUT_RIGHT
+    if rng.random() < 0.5:
+        inputs |= game.INPUT_JUMP
+    return inputs, rng.randint(1, MAX_HOLD_TICKS)
+
+def check_player(player):
+    if not (math.isfinite(player.x) and math.isfinite(player.y) and math.isfinite(player.vel_y)):
+        return f"non-finite player state x={player.x} y={player.y} vel_y={player.vel_y}"
+    if player.x < 0 or (player.max_x is not None and player.x + player.width > player.max_x):
+        return f"player outside level bounds at x={player.x}"
+    if player.y + player.height > game.HEIGHT - 50 + 1e-6:
+        return f"player below the ground at y={player.y}"
+    return None
+
+def fuzz_run(level_num, seed, policy):
+    """Play one run; returns its outcome with everything the report aggregates"""
+    rng = random.Random(seed)
+    session = game.GameSession(level_num, seed=seed)
+    player = session.player
+    platform_index = {id(p.data): i for i, p in enumerate(session.geometry.platforms)}
+    result = {'seed': seed, 'policy': policy, 'won': False, 'deaths': [], 'landed': set(),
+              'stall': None, 'anomaly': None, 'error': None}
+
+    progress_x = player.furthest_x
+    progress_tick = 0
+    pushing = 0
+    try:
+        while not session.game_over:
+            inputs, hold = next_inputs(rng, policy)
+            for _ in range(hold):
+                deaths = player.deaths
+                x = player.x
+                session.step(inputs)
+                if player.deaths != deaths:
+                    # reset() has already moved the player back; this is within a step of the hit
+                    result['deaths'].append(x)
+                if player.ground_platform is not None:
+                    result['landed'].add(platform_index.get(id(player.ground_platform)))
+
+                if player.furthest_x > progress_x:
+                    progress_x = player.furthest_x
+                    progress_tick = session.ticks
+                    pushing = 0
+                elif inputs & game.INPUT_RIGHT:
+                    pushing += 1
+
+                anomaly = check_player(player)
+                if anomaly:
+                    result['anomaly'] = {'tick': session.ticks, 'error': anomaly}
+                    return result
+                if session.game_over:
+                    break
+    except Exception:
+        result['error'] = {'tick': session.ticks, 'error': traceback.format_exc()}
+        return result
+
+    result['won'] = session.won
+    stalled_ticks = session.ticks - progress_tick
+    if not session.won and player.lives > 0 and stalled_ticks >= STALL_TICKS and pushing > stalled_ticks // 2:
+        result['stall'] = {'x': int(progress_x), 'ticks': stalled_ticks}
+    return result
+
+def fuzz_batch(task):
+    level_num, seeds = task
+    results = []
+    for seed in seeds:
+        results.append(fuzz_run(level_num, seed, POLICIES[seed % len(POLICIES)]))
+    return level_num, results
+
+def summarize(level_num, results):
+    session = game.GameSession(level_num, seed=0)
+    rows = [p.data for p in session.geometry.platforms]
+    runs = len(results)
+
+    deaths = Counter()
+    landed = Counter()
+    for result in results:
+        for x in result['deaths']:
+            deaths[int(x) // DEATH_BUCKET * DEATH_BUCKET] += 1
+        landed.update(result['landed'])
+
+    reach = [{'x': row['x'], 'y': row['y'], 'width': row['width'], 'rate': landed[i] / runs if runs else 0}
+             for i, row in enumerate(rows)]
+    return {
+        'runs': runs,
+        'win_rate': sum(result['won'] for result in results) / runs if runs else 0,
+        'wins_by_policy': {policy: sum(r['won'] for r in results if r['policy'] == policy) for policy in POLICIES},
+        'deaths': sum(deaths.values()),
+        'death_hotspots': [{'x': x, 'deaths': count} for x, count in deaths.most_common(10)],
+        'platform_reach': reach,
+        'never_reached': [platform for platform in reach if platform['rate'] == 0],
+        'stalls': [dict(r['stall'], seed=r['seed']) for r in results if r['stall']],
+        'anomalies': [dict(r['anomaly'], seed=r['seed']) for r in results if r['anomaly']],
+        'exceptions': [dict(r['error'], seed=r['seed']) for r in results if r['error']],
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--levels', type=int, nargs='*', help='levels to fuzz (default: all)')
+    parser.add_argument('--runs', type=int, default=1000, help='runs per level')
+    parser.add_argument('--seed', type=int, default=0, help='first run seed')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='worker processes (default: all cores)')
+    parser.add_argument('--output', help='also write the report to this file')
+    args = parser.parse_args(argv)
+
+    levels = args.levels or sorted(game.LEVEL_CONFIG)
+    tasks = []
+    for level_num in levels:
+        seeds = list(range(args.seed, args.seed + args.runs))
+        for i in range(0, len(seeds), BATCH_SIZE):
+            tasks.append((level_num, seeds[i:i + BATCH_SIZE]))
+
+    start = time.perf_counter()
+    results = {level_num: [] for level_num in levels}
+    with multiprocessing.Pool(args.workers) as pool:
+        for level_num, batch in pool.imap_unordered(fuzz_batch, tasks):
+            results[level_num].extend(batch)
+    elapsed = time.perf_counter() - start
+
+    report = {'workers': args.workers, 'runs_per_level': args.runs, 'elapsed_s': round(elapsed, 2), 'levels': {}}
+    failures = 0
+    for level_num in levels:
+        level_results = sorted(results[level_num], key=lambda r: r['seed'])
+        summary = summarize(level_num, level_results)
+        report['levels'][str(level_num)] = summary
+        failures += len(summary['exceptions']) + len(summary['anomalies'])
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    print(f"Fuzzed {len(levels)} levels x {args.runs} runs on {args.workers} workers in {elapsed:.1f}s, "
+          f"{failures} runs with exceptions or broken state", file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
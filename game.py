@@ -1,16 +1,33 @@
+import time
+IMPORT_START = time.perf_counter()
+
 import pygame
 import random
 import math
 import sys
-import time
 import json
 import os
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import hashlib
+import threading
 
-pygame.init()
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 WIDTH, HEIGHT = 1280, 720
 FPS = 60
 
+# Physics always advances in fixed ticks; rendering interpolates between them
+SIM_RATE = 60
+SIM_STEP_MS = 1000 / SIM_RATE
+MAX_FRAME_MS = 250
+
 COLORS = {
     'bg_dark': (15, 15, 25),
     'bg_mid': (30, 30, 45),
@@ -26,10 +43,45 @@ COLORS = {
     'dark_gray': (64, 64, 64),
 }
 
+STATIC_GRAYS = [0, 64, 128, 192, 255]
+COLOR_KEY = (255, 0, 255)  # transparent colour for cached overlay surfaces
+GLITCH_MIN_INTENSITY = 0.2
+MAX_FRAGMENT_SURFACES = 256
+
+PARALLAX_FACTORS = [0.3, 0.6, 0.85]
+BUILDING_MIN_Y = 150
+BUILDING_TILE_WIDTH = 512
+BUILDING_DECAY_BUCKETS = 20
+MAX_BUILDING_TILES = 24
+BUILDING_OVERHANG = 17  # windows reach 15px past a building's right edge, plus 2px of crack shift
+
+DEATH_CHUNK_LIFETIME_MS = 8000  # None keeps chunks until the level restarts
+MAX_DEATH_CHUNKS = 9
+DEATH_CHUNK_NOISE_FRAMES = 3
+DEATH_CHUNK_FLICKER_MS = 100
+
 PLAYER_SIZE = 55
 PLAYER_SPEED = 6
 JUMP_STRENGTH = 16
 GRAVITY = 0.8
+PLAYER_FRAME_MS = 150  # real time each sprite frame stays up
+LANDING_BAND = 20  # feet may end a tick this far below a platform's top and still land on it
+
+PLATFORM_MIN_Y = 240
+PLATFORM_MAX_Y = 520
+STEP_RISE = 100    # a straight-up jump reliably lands on a platform this far above
+
+# Compiled geometry and replays are only valid for these, so they go into the cache and replay keys
+PHYSICS_STAMP = ':'.join(str(value) for value in [SIM_RATE, HEIGHT, PLAYER_SIZE, PLAYER_SPEED, JUMP_STRENGTH,
+                                                   GRAVITY, LANDING_BAND, PLATFORM_MIN_Y, PLATFORM_MAX_Y, STEP_RISE])
+
+# Per-tick input bitmask consumed by GameSession.step
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_JUMP = 4
+
+# Glitch fragments can be thrown this far past an entity's bounds
+CULL_MARGIN = 32
 
 TITLE = "title"
 LOADING = "loading"
@@ -37,6 +89,26 @@ LEVEL_SELECT = "level_select"
 PLAYING = "playing"
 GAME_OVER = "game_over"
 
+# Menus only repaint what changed and slow down to this rate when idle
+MENU_IDLE_FPS = 15
+TITLE_NOISE_RECT = pygame.Rect(0, HEIGHT - 100, WIDTH, 100)
+
+# Endless mode streams its world in chunks around the camera, giving world
+# generation at most STREAM_BUDGET_MS of each frame
+ENDLESS_LEVEL = 0
+ENDLESS_CHUNK_WIDTH = 1600
+ENDLESS_CHUNKS_AHEAD = 2
+ENDLESS_CHUNKS_BEHIND = 1
+ENDLESS_SPAWN_OFFSET = 50
+ENDLESS_DECAY_DISTANCE = 20000  # decay reaches 0.5 this far in
+STREAM_BUDGET_MS = 2
+
+LOADING_MIN_DISPLAY_MS = 800  # 0 ends the loading screen as soon as the level is built
+MAX_PREFETCHED_LEVELS = 3
+
+PROFILE_PHASES = ['physics', 'stream', 'buildings', 'platforms', 'obstacles', 'player',
+                  'glitch', 'death_chunks', 'static', 'hud', 'flip']
+
 LOADING_QUOTES = [
     "Life exists in the spaces between permanence...",
     "Every step forward is a step toward dissolution.",
@@ -52,18 +124,93 @@ LOADING_QUOTES = [
     "Your footprints disappear behind you.",
 ]
 
-LEVEL_CONFIG = {
-    1: {'time': 45, 'distance': 2000, '3star': 25, '2star': 35, 'no_death': False},
-    2: {'time': 50, 'distance': 2400, '3star': 30, '2star': 40, 'no_death': False},
-    3: {'time': 55, 'distance': 2800, '3star': 35, '2star': 45, 'no_death': False},
-    4: {'time': 60, 'distance': 3200, '3star': 40, '2star': 50, 'no_death': True},
-    5: {'time': 50, 'distance': 2600, '3star': 30, '2star': 40, 'no_death': False},
-    6: {'time': 65, 'distance': 3400, '3star': 45, '2star': 55, 'no_death': False},
-    7: {'time': 70, 'distance': 3800, '3star': 50, '2star': 60, 'no_death': True},
-    8: {'time': 55, 'distance': 3000, '3star': 35, '2star': 45, 'no_death': False},
-    9: {'time': 75, 'distance': 4200, '3star': 55, '2star': 65, 'no_death': False},
-    10: {'time': 60, 'distance': 3600, '3star': 40, '2star': 50, 'no_death': True},
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(BASE_DIR, '.entropy_cache')
+
+# Bump when ensure_playable_platforms changes so cached geometry is rebuilt;
+# physics changes are picked up through PHYSICS_STAMP
+PLAYABLE_VERSION = 3
+
+SAVE_FILE = 'entropy_save.txt'
+# 1 stored level_scores as a JSON object, which turned the level numbers into strings
+SAVE_VERSION = 2
+
+# Bump when level geometry or simulation code change, as old replays no longer reproduce;
+# replays also record PHYSICS_STAMP
+REPLAY_VERSION = 4
+REPLAY_DIR = os.path.join(BASE_DIR, 'replays')
+MAX_REPLAYS_PER_LEVEL = 20
+
+PLAYER_SPRITE_GIFS = {
+    "stand_left": "graphics/oldManStandLeft.gif",
+    "stand_right": "graphics/oldManStandRight.gif",
+    "walk_left": "graphics/oldManWalkLeft.gif",
+    "walk_right": "graphics/oldManWalkRight.gif",
 }
+SPRITE_ATLAS_VERSION = 1
+
+class LevelPack(Mapping):
+    """Level configs read lazily from pack.json, with compiled geometry cached on disk"""
+
+    def __init__(self, directory, cache_dir=None):
+        self.directory = directory
+        self.cache_dir = cache_dir
+        self.configs = None
+        self.compiled = {}
+        
+    def load_index(self):
+        if self.configs is None:
+            with open(os.path.join(self.directory, 'pack.json'), 'r') as f:
+                index = json.load(f)
+            self.configs = {entry['level']: entry for entry in index['levels']}
+        return self.configs
+        
+    def __getitem__(self, level_num):
+        return self.load_index()[level_num]
+        
+    def __iter__(self):
+        return iter(self.load_index())
+        
+    def __len__(self):
+        return len(self.load_index())
+        
+    def geometry(self, level_num):
+        """Return (platform rows, obstacle rows) with playability patches applied"""
+        if level_num in self.compiled:
+            return self.compiled[level_num]
+        
+        config = self[level_num]
+        with open(os.path.join(self.directory, config['file']), 'rb') as f:
+            raw = f.read()
+        digest = hashlib.sha1(raw)
+        digest.update(f"{config['distance']}:{PLAYABLE_VERSION}:{PHYSICS_STAMP}".encode())
+        cache_path = None
+        if self.cache_dir:
+            cache_path = os.path.join(self.cache_dir, 'levels', digest.hexdigest() + '.json')
+        
+        compiled = None
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'r') as f:
+                    cached = json.load(f)
+                compiled = (cached['platforms'], cached['obstacles'])
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Ignoring bad level cache {cache_path}: {e}")
+        
+        if compiled is None:
+            compiled = compile_level(json.loads(raw), config['distance'])
+            if cache_path:
+                try:
+                    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                    with open(cache_path, 'w') as f:
+                        json.dump({'platforms': compiled[0], 'obstacles': compiled[1]}, f, separators=(',', ':'))
+                except OSError as e:
+                    print(f"Could not write level cache: {e}")
+        
+        self.compiled[level_num] = compiled
+        return compiled
+
+LEVEL_CONFIG = LevelPack(os.path.join(BASE_DIR, 'levels'), CACHE_DIR)
 
 class Building:
     def __init__(self, x, y, width, height, layer, building_type):
@@ -73,15 +220,12 @@ class Building:
         self.height = height
         self.layer = layer  # 0 = far back, 1 = mid, 2 = close
         self.type = building_type  # 'tall', 'wide', 'square'
+        # Stable per-building seed so cached renders look the same every time
+        self.seed = (x * 7919 + y * 104729 + width * 31 + layer) & 0xFFFFFFFF
         
-    def draw(self, screen, camera, decay_factor, glitch_intensity):
-        # Parallax effect - further layers move slower
-        parallax_factor = [0.3, 0.6, 0.85][self.layer]
-        draw_x = int(self.x - camera.x * parallax_factor)
-        
-        # Don't draw if off screen
-        if draw_x + self.width < 0 or draw_x > WIDTH:
-            return
+    def render(self, surface, draw_x, top, decay_factor, bucket):
+        rng = random.Random(self.seed * BUILDING_DECAY_BUCKETS + bucket)
+        building_y = self.y - top
         
         # Color based on layer and decay
         base_gray = [60, 80, 100][self.layer]
@@ -95,7 +239,7 @@ class Building:
             section_height = self.height // num_sections
             
             for i in range(num_sections):
-                section_y = self.y + i * section_height
+                section_y = building_y + i * section_height
                 
                 # Very subtle fall - only top sections
                 fall_offset = 0
@@ -103,17 +247,17 @@ class Building:
                     fall_offset = int((decay_factor - 0.6) * i * 8)  # Much less fall
                 
                 # Small horizontal cracks
-                crack_offset = random.randint(-2, 2) if decay_factor > 0.8 else 0
+                crack_offset = rng.randint(-2, 2) if decay_factor > 0.8 else 0
                 
                 # Some sections missing (creating rubble gaps)
-                section_missing = (decay_factor > 0.85 and random.random() < (decay_factor - 0.85) * 2)
+                section_missing = (decay_factor > 0.85 and rng.random() < (decay_factor - 0.85) * 2)
                 
                 if not section_missing:
                     section_x = draw_x + crack_offset
                     section_w = self.width
                     
                     # Draw building section
-                    pygame.draw.rect(screen, building_color, 
+                    pygame.draw.rect(surface, building_color, 
                                    (section_x, section_y + fall_offset, section_w, section_height))
                     
                     # Draw windows if not too decayed
@@ -122,72 +266,108 @@ class Building:
                         window_size = 8
                         for wx in range(0, section_w, 24):
                             # Some windows broken at higher decay
-                            if random.random() > (decay_factor - 0.6) * 1.5:
-                                pygame.draw.rect(screen, window_color,
+                            if rng.random() > (decay_factor - 0.6) * 1.5:
+                                pygame.draw.rect(surface, window_color,
                                                (section_x + wx + 8, section_y + fall_offset + 4, 
                                                 window_size, window_size))
                 else:
                     # Draw rubble where section is missing
-                    if random.random() < 0.6:
+                    if rng.random() < 0.6:
                         rubble_color = (int(gray_val * 0.7), int(gray_val * 0.7), int((gray_val + 10) * 0.7))
-                        rubble_pieces = random.randint(3, 6)
+                        rubble_pieces = rng.randint(3, 6)
                         for _ in range(rubble_pieces):
-                            rubble_x = draw_x + random.randint(0, self.width - 8)
-                            rubble_y = section_y + fall_offset + random.randint(0, section_height - 8)
-                            rubble_size = random.randint(4, 12)
-                            pygame.draw.rect(screen, rubble_color,
+                            rubble_x = draw_x + rng.randint(0, self.width - 8)
+                            rubble_y = section_y + fall_offset + rng.randint(0, section_height - 8)
+                            rubble_size = rng.randint(4, 12)
+                            pygame.draw.rect(surface, rubble_color,
                                            (rubble_x, rubble_y, rubble_size, rubble_size))
         else:
             # Intact or slightly worn building
-            pygame.draw.rect(screen, building_color, (draw_x, self.y, self.width, self.height))
+            pygame.draw.rect(surface, building_color, (draw_x, building_y, self.width, self.height))
             
             # Draw windows
             window_color = (int(gray_val * 1.3), int(gray_val * 1.3), int((gray_val + 10) * 1.3))
-            for wy in range(self.y + 20, self.y + self.height - 20, 32):
+            for wy in range(building_y + 20, building_y + self.height - 20, 32):
                 for wx in range(0, self.width, 24):
                     # Slight decay - some windows dark
-                    if random.random() > decay_factor * 0.5:
-                        pygame.draw.rect(screen, window_color,
+                    if rng.random() > decay_factor * 0.5:
+                        pygame.draw.rect(surface, window_color,
                                        (draw_x + wx + 8, wy, 8, 8))
                     elif decay_factor > 0.4:
                         # Broken window (darker)
                         dark_window = (int(gray_val * 0.5), int(gray_val * 0.5), int((gray_val + 10) * 0.5))
-                        pygame.draw.rect(screen, dark_window,
+                        pygame.draw.rect(surface, dark_window,
                                        (draw_x + wx + 8, wy, 8, 8))
 
 class Camera:
-    def __init__(self):
-        self.x = 0
+    def __init__(self, x=0):
+        self.x = x
+        self.prev_x = x
         
     def update(self, player):
+        self.prev_x = self.x
         target_x = player.x - WIDTH // 3
         self.x += (target_x - self.x) * 0.1
         self.x = max(0, self.x)
 
+    def interpolated(self, alpha):
+        return Camera(self.prev_x + (self.x - self.prev_x) * alpha)
+
+    def is_visible(self, x, width, margin=CULL_MARGIN):
+        return x + width >= self.x - margin and x <= self.x + WIDTH + margin
+
+class PlayerAnimation:
+    """The player's sprite frames per (moving, facing) state, advanced by real elapsed time"""
+    STATE_KEYS = ['stand_right', 'stand_left', 'walk_right', 'walk_left']
+
+    def __init__(self, sprites, frame_ms=PLAYER_FRAME_MS):
+        default = sprites.get('stand_right') or next(iter(sprites.values()))
+        self.tables = []
+        for key in self.STATE_KEYS:
+            stand = sprites.get('stand_' + key.split('_')[1]) or default
+            self.tables.append(sprites.get(key) or stand)
+        self.frame_ms = frame_ms
+        self.state = 0
+        self.frame = 0
+        self.elapsed = 0
+        
+    def advance(self, state, dt_ms):
+        if state != self.state:
+            self.state = state
+            self.frame = 0
+            self.elapsed = 0
+        else:
+            self.elapsed += dt_ms
+            if self.elapsed >= self.frame_ms:
+                steps, self.elapsed = divmod(self.elapsed, self.frame_ms)
+                self.frame = (self.frame + int(steps)) % len(self.tables[state])
+        return self.tables[state][self.frame]
+
 class Player:
     def __init__(self, x, y, sprites=None):
         self.start_x = x
         self.start_y = y
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
         self.width = 48
         self.height = 48
         self.vel_y = 0
         self.on_ground = False
+        self.ground_platform = None  # platform data landed on this tick, if any
         self.lives = 3
         self.furthest_x = x
         self.deaths = 0
-        self.sprites = sprites or {}
+        # sprites maps animation keys to frame lists, already in display format
+        self.animation = PlayerAnimation(sprites) if sprites else None
         self.facing = "right"
         self.is_moving = False
-        self.animation_frame = 0
-        self.animation_timer = 0
-        self.animation_speed = 150
         self.max_x = None
 
-        if self.sprites.get("stand_right"):
-            self.width = self.sprites["stand_right"].get_width()
-            self.height = self.sprites["stand_right"].get_height()
+        if self.animation is not None:
+            self.width = self.animation.tables[0][0].get_width()
+            self.height = self.animation.tables[0][0].get_height()
         else:
             self.width = PLAYER_SIZE
             self.height = PLAYER_SIZE
@@ -195,16 +375,20 @@ class Player:
     def reset(self):
         self.x = self.start_x
         self.y = self.start_y
+        self.prev_x = self.x
+        self.prev_y = self.y
         self.vel_y = 0
         
-    def update(self, platforms):
-        keys = pygame.key.get_pressed()
+    def update(self, platforms, inputs=0):
+        self.prev_x = self.x
+        self.prev_y = self.y
+
         self.is_moving = False
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+        if inputs & INPUT_LEFT:
             self.x -= PLAYER_SPEED
             self.is_moving = True
             self.facing = "left"
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+        if inputs & INPUT_RIGHT:
             self.x += PLAYER_SPEED
             self.is_moving = True
             self.facing = "right"
@@ -212,17 +396,25 @@ class Player:
         if self.x > self.furthest_x:
             self.furthest_x = self.x
         
+        prev_feet = self.y + self.height
         self.vel_y += GRAVITY
         self.y += self.vel_y
+        feet = self.y + self.height
         
+        # Swept landing: any fall that passes a top this tick lands on the
+        # first one crossed, however fast it is going
         self.on_ground = False
-        for platform in platforms:
-            if (self.x + self.width > platform['x'] and 
-                self.x < platform['x'] + platform['width'] and
-                self.y + self.height > platform['y'] and
-                self.y + self.height < platform['y'] + 20 and
-                self.vel_y > 0):
-                self.y = platform['y'] - self.height
+        self.ground_platform = None
+        if self.vel_y > 0:
+            for platform in platforms:
+                if (self.x + self.width > platform['x'] and 
+                    self.x < platform['x'] + platform['width'] and
+                    feet > platform['y'] and
+                    prev_feet < platform['y'] + LANDING_BAND and
+                    (self.ground_platform is None or platform['y'] < self.ground_platform['y'])):
+                    self.ground_platform = platform
+            if self.ground_platform is not None:
+                self.y = self.ground_platform['y'] - self.height
                 self.vel_y = 0
                 self.on_ground = True
                 
@@ -241,28 +433,13 @@ class Player:
         if self.on_ground:
             self.vel_y = -JUMP_STRENGTH
             
-    def draw(self, screen, camera, decay_factor):
-        draw_x = int(self.x - camera.x)
-        draw_y = int(self.y)
-
-        sprite = None
-        if self.sprites:
-            self.animation_timer += 16
-            if self.animation_timer >= self.animation_speed:
-                self.animation_timer = 0
-                self.animation_frame = (self.animation_frame + 1) % 2
-            
-            if self.is_moving:
-                sprite_key = f"walk_{self.facing}_{self.animation_frame}"
-                sprite = self.sprites.get(sprite_key)
-                if not sprite:
-                    sprite = self.sprites.get(f"walk_{self.facing}_0")
-            else:
-                sprite_key = f"stand_{self.facing}"
-                sprite = self.sprites.get(sprite_key)
+    def draw(self, screen, camera, decay_factor, alpha=1.0, dt_ms=0):
+        draw_x = int(self.prev_x + (self.x - self.prev_x) * alpha - camera.x)
+        draw_y = int(self.prev_y + (self.y - self.prev_y) * alpha)
 
-        if sprite:
-            screen.blit(sprite, (draw_x, draw_y))
+        if self.animation is not None:
+            state = (2 if self.is_moving else 0) + (1 if self.facing == "left" else 0)
+            screen.blit(self.animation.advance(state, dt_ms), (draw_x, draw_y))
         else:
             color_intensity = int(255 * (1 - decay_factor))
             player_color = (color_intensity, 100 + int(155 * (1 - decay_factor)), color_intensity)
@@ -271,11 +448,29 @@ class Player:
             pygame.draw.rect(screen, eye_color, (draw_x + 6, draw_y + 8, 4, 4))
             pygame.draw.rect(screen, eye_color, (draw_x + 14, draw_y + 8, 4, 4))
 
+_fragments = OrderedDict()
+
+def fragment_surface(color, width, height):
+    """Solid block used for glitch fragments, cached so they can be batch-blitted"""
+    key = (color, width, height)
+    surface = _fragments.get(key)
+    if surface is None:
+        surface = pygame.Surface((width, height))
+        surface.fill(color)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        _fragments[key] = surface
+        if len(_fragments) > MAX_FRAGMENT_SURFACES:
+            _fragments.popitem(last=False)
+    else:
+        _fragments.move_to_end(key)
+    return surface
+
 class Platform:
     def __init__(self, x, y, width, height, platform_type='grass'):
         self.data = {'x': x, 'y': y, 'width': width, 'height': height, 'type': platform_type}
         
-    def draw(self, screen, camera, decay_factor, glitch_intensity):
+    def draw(self, screen, camera, decay_factor, glitch_intensity, batch=None):
         x, y, w, h = self.data['x'], self.data['y'], self.data['width'], self.data['height']
         draw_x = int(x - camera.x)
         
@@ -285,12 +480,17 @@ class Platform:
         else:
             color = COLORS['brown']
         
-        if glitch_intensity > 0.2:
+        if glitch_intensity > GLITCH_MIN_INTENSITY:
             num_pieces = int(3 + glitch_intensity * 12)
             piece_width = max(8, w // num_pieces)
             max_offset = int(glitch_intensity * glitch_intensity * 20)
+            fragment = fragment_surface(color, piece_width, h)
+            pieces = []
             
-            for i in range(num_pieces):
+            # Only fragment the pieces on screen; the ground spans the whole level
+            first = max(0, (-CULL_MARGIN - draw_x) // piece_width)
+            last = min(num_pieces, (WIDTH + CULL_MARGIN - draw_x) // piece_width + 1)
+            for i in range(first, last):
                 piece_x = draw_x + i * piece_width
                 offset_y = random.randint(-max_offset, max_offset // 2)
                 piece_y = y + offset_y
@@ -298,7 +498,12 @@ class Platform:
                 if random.random() > glitch_intensity * 0.4:
                     aligned_x = (piece_x // 4) * 4
                     aligned_y = (piece_y // 4) * 4
-                    pygame.draw.rect(screen, color, (aligned_x, aligned_y, piece_width, h))
+                    pieces.append((fragment, (aligned_x, aligned_y)))
+            
+            if batch is None:
+                screen.blits(pieces, False)
+            else:
+                batch.extend(pieces)
         else:
             pygame.draw.rect(screen, color, (draw_x, y, w, h))
 
@@ -309,29 +514,57 @@ class Obstacle:
         self.width = width
         self.height = height
         
-    def draw(self, screen, camera, decay_factor, glitch_intensity):
+    def draw(self, screen, camera, decay_factor, glitch_intensity, batch=None):
         draw_x = int(self.x - camera.x)
         color = COLORS['red']
         
         if glitch_intensity > 0.3:
             num_fragments = int(2 + glitch_intensity * 4)
             max_offset = int(glitch_intensity * glitch_intensity * 25)
+            frag_size = max(8, self.width // num_fragments)
+            fragment = fragment_surface(color, frag_size, frag_size)
+            pieces = []
             
             for i in range(num_fragments):
                 offset_x = random.randint(-max_offset, max_offset)
                 offset_y = random.randint(-max_offset, max_offset)
                 frag_x = ((draw_x + offset_x) // 4) * 4
                 frag_y = ((self.y + offset_y) // 4) * 4
-                frag_size = max(8, self.width // num_fragments)
-                pygame.draw.rect(screen, color, (frag_x, frag_y, frag_size, frag_size))
+                pieces.append((fragment, (frag_x, frag_y)))
         else:
-            pygame.draw.rect(screen, color, (draw_x, self.y, self.width, self.height))
+            pieces = [(fragment_surface(color, self.width, self.height), (draw_x, self.y))]
+        
+        if batch is None:
+            screen.blits(pieces, False)
+        else:
+            batch.extend(pieces)
         
     def check_collision(self, player):
         return (player.x + player.width > self.x and 
                 player.x < self.x + self.width and
                 player.y + player.height > self.y and
                 player.y < self.y + self.height)
+        
+    def check_sweep(self, player):
+        """Swept AABB test along the player's straight-line move this tick"""
+        t_enter, t_exit = 0.0, 1.0
+        for start, end, size, lo, span in ((player.prev_x, player.x, player.width, self.x, self.width),
+                                           (player.prev_y, player.y, player.height, self.y, self.height)):
+            delta = end - start
+            if delta == 0:
+                if not (start + size > lo and start < lo + span):
+                    return False
+                continue
+            # Times at which this axis starts and stops overlapping
+            t0 = (lo - size - start) / delta
+            t1 = (lo + span - start) / delta
+            if t0 > t1:
+                t0, t1 = t1, t0
+            t_enter = max(t_enter, t0)
+            t_exit = min(t_exit, t1)
+            if t_enter >= t_exit:
+                return False
+        return True
 
 class Goal:
     def __init__(self, x, y):
@@ -340,11 +573,15 @@ class Goal:
         self.width = 32
         self.height = 48
         self.pulse = 0
+
+    def update(self):
+        self.pulse = (self.pulse + 0.1) % (2 * math.pi)
         
     def draw(self, screen, camera, decay_factor):
+        if not camera.is_visible(self.x, self.width):
+            return
         draw_x = int(self.x - camera.x)
         
-        self.pulse = (self.pulse + 0.1) % (2 * math.pi)
         pulse_size = int(4 * math.sin(self.pulse))
         
         color = COLORS['gold']
@@ -362,25 +599,92 @@ class Goal:
                 player.y < self.y + self.height)
 
 class DeathChunk:
-    def __init__(self, x, y, width, height):
+    def __init__(self, x, y, width, height, born_ms=0, seed=None):
         self.x = x
         self.y = y
         self.width = width
         self.height = height
+        self.born_ms = born_ms
+        self.seed = seed
     
-    def draw(self, screen):
-        for x in range(0, self.width, 8):
-            for y in range(0, self.height, 8):
-                if random.random() < 0.7:
-                    gray = random.choice([0, 64, 128, 192, 255])
-                    pygame.draw.rect(screen, (gray, gray, gray), 
-                                   (self.x + x, self.y + y, 8, 8))
+    def bake(self, num_frames):
+        rng = random.Random(self.seed)
+        frames = []
+        for _ in range(num_frames):
+            surface = pygame.Surface((self.width, self.height))
+            surface.fill(COLOR_KEY)
+            surface.set_colorkey(COLOR_KEY)
+            for x in range(0, self.width, 8):
+                for y in range(0, self.height, 8):
+                    if rng.random() < 0.7:
+                        gray = rng.choice(STATIC_GRAYS)
+                        pygame.draw.rect(surface, (gray, gray, gray), (x, y, 8, 8))
+            frames.append(surface)
+        return frames
+
+class DeathChunkOverlay:
+    """Death chunks composited into a few cached noise frames, rebuilt only when the set changes"""
+
+    def __init__(self, lifetime_ms=DEATH_CHUNK_LIFETIME_MS, max_chunks=MAX_DEATH_CHUNKS,
+                 num_frames=DEATH_CHUNK_NOISE_FRAMES):
+        self.lifetime_ms = lifetime_ms
+        self.max_chunks = max_chunks
+        self.num_frames = num_frames
+        self.chunks = []
+        self.chunk_frames = {}
+        self.frames = None
+        self.origin = (0, 0)
+        
+    def __len__(self):
+        return len(self.chunks)
+        
+    def add(self, chunk):
+        # Noise is baked on the next draw, so headless sessions never touch surfaces
+        self.chunks.append(chunk)
+        while len(self.chunks) > self.max_chunks:
+            self.chunk_frames.pop(self.chunks.pop(0), None)
+        self.frames = None
+        
+    def expire(self, now_ms):
+        if self.lifetime_ms is None:
+            return
+        expired = [c for c in self.chunks if now_ms - c.born_ms >= self.lifetime_ms]
+        if expired:
+            for chunk in expired:
+                self.chunks.remove(chunk)
+                self.chunk_frames.pop(chunk, None)
+            self.frames = None
+            
+    def rebuild(self):
+        # Composite only the area the chunks cover
+        bounds = pygame.Rect(self.chunks[0].x, self.chunks[0].y, self.chunks[0].width, self.chunks[0].height)
+        bounds.unionall_ip([pygame.Rect(c.x, c.y, c.width, c.height) for c in self.chunks[1:]])
+        self.origin = bounds.topleft
+        self.frames = []
+        for i in range(self.num_frames):
+            surface = pygame.Surface(bounds.size)
+            surface.fill(COLOR_KEY)
+            surface.set_colorkey(COLOR_KEY)
+            for chunk in self.chunks:
+                if chunk not in self.chunk_frames:
+                    self.chunk_frames[chunk] = chunk.bake(self.num_frames)
+                surface.blit(self.chunk_frames[chunk][i], (chunk.x - bounds.x, chunk.y - bounds.y))
+            self.frames.append(surface)
+            
+    def draw(self, screen, now_ms):
+        if not self.chunks:
+            return
+        if self.frames is None:
+            self.rebuild()
+        frame = int(now_ms // DEATH_CHUNK_FLICKER_MS) % self.num_frames
+        screen.blit(self.frames[frame], self.origin)
 
 class LevelButton:
     def __init__(self, x, y, level_num, stars=0, locked=False):
         self.x = x
         self.y = y
         self.size = 90
+        self.rect = pygame.Rect(x, y, self.size, self.size)
         self.level_num = level_num
         self.stars = stars
         self.locked = locked
@@ -399,7 +703,7 @@ class LevelButton:
             pygame.draw.rect(screen, lock_color, (self.x + 39, self.y + 30, 12, 16))
             pygame.draw.rect(screen, bg_color, (self.x + 41, self.y + 32, 8, 12))
         else:
-            text = font.render(str(self.level_num), True, COLORS['white'])
+            text = render_text(font, str(self.level_num), True, COLORS['white'])
             text_rect = text.get_rect(center=(self.x + self.size // 2, self.y + 30))
             screen.blit(text, text_rect)
             
@@ -437,6 +741,7 @@ class ArrowButton:
         self.x = x
         self.y = y
         self.size = 80
+        self.rect = pygame.Rect(x, y, self.size, self.size)
         self.direction = direction
         self.hovered = False
         
@@ -468,331 +773,449 @@ class ArrowButton:
     def check_click(self, mouse_pos):
         return self.check_hover(mouse_pos)
 
-def ensure_playable_platforms(platforms):
-    max_gap = 180
-    min_width = max(90, PLAYER_SIZE + 20)
-    min_y = 240
-    max_y = 520
+class SpatialIndex:
+    """x-sorted index over level shapes, with screen-wide ones like the ground kept out of the bisect"""
 
-    platforms.sort(key=lambda p: p.data['x'])
-    safe_platforms = []
-    last_end_x = None
-    last_y = None
+    def __init__(self, items, bounds, wide_threshold=WIDTH):
+        self.wide = []
+        narrow = []
+        for item in items:
+            x, width = bounds(item)
+            if width > wide_threshold:
+                self.wide.append((x, x + width, item))
+            else:
+                narrow.append((x, x + width, item))
+        narrow.sort(key=lambda entry: entry[0])
+        self.xs = [entry[0] for entry in narrow]
+        self.entries = narrow
+        self.max_width = max((end - x for x, end, _ in narrow), default=0)
 
-    for platform in platforms:
-        x = platform.data['x']
-        y = platform.data['y']
-        width = max(min_width, platform.data['width'])
-        height = platform.data['height']
+    def query(self, x0, x1):
+        found = [item for x, end, item in self.wide if end >= x0 and x <= x1]
+        lo = bisect_left(self.xs, x0 - self.max_width)
+        hi = bisect_right(self.xs, x1)
+        for i in range(lo, hi):
+            x, end, item = self.entries[i]
+            if end >= x0:
+                found.append(item)
+        return found
+
+class LevelGeometry:
+    def __init__(self, platforms, obstacles):
+        self.platforms = platforms
+        self.obstacles = obstacles
+        self.platform_index = SpatialIndex(platforms, lambda p: (p.data['x'], p.data['width']))
+        self.obstacle_index = SpatialIndex(obstacles, lambda o: (o.x, o.width))
+        self.platform_xywh = None
+        self.obstacle_xywh = None
+
+    def platforms_near(self, x0, x1):
+        return self.platform_index.query(x0, x1)
+
+    def obstacles_near(self, x0, x1):
+        return self.obstacle_index.query(x0, x1)
+
+    def as_arrays(self):
+        """Platforms and obstacles as (4, n) float arrays of x, y, width, height rows; needs numpy"""
+        if self.platform_xywh is None:
+            self.platform_xywh = np.array([[p.data['x'] for p in self.platforms], [p.data['y'] for p in self.platforms],
+                                           [p.data['width'] for p in self.platforms],
+                                           [p.data['height'] for p in self.platforms]], dtype=np.float64).reshape(4, -1)
+            self.obstacle_xywh = np.array([[o.x for o in self.obstacles], [o.y for o in self.obstacles],
+                                           [o.width for o in self.obstacles],
+                                           [o.height for o in self.obstacles]], dtype=np.float64).reshape(4, -1)
+        return self.platform_xywh, self.obstacle_xywh
+
+class EndlessWorld:
+    """Endless-mode geometry as LevelGeometry chunks around the camera, each a pure function of seed and index"""
+
+    def __init__(self, seed):
+        self.seed = seed
+        self.chunks = {}
+        
+    def chunk(self, index):
+        geometry = self.chunks.get(index)
+        if geometry is None:
+            geometry = self.chunks[index] = LevelGeometry(*generate_chunk(self.seed, index))
+        return geometry
+        
+    def chunks_near(self, x0, x1):
+        # Chunk contents never cross chunk edges
+        first = max(0, int(x0 // ENDLESS_CHUNK_WIDTH))
+        last = max(first, int(x1 // ENDLESS_CHUNK_WIDTH))
+        return [self.chunk(index) for index in range(first, last + 1)]
+
+    def platforms_near(self, x0, x1):
+        found = []
+        for chunk in self.chunks_near(x0, x1):
+            found.extend(chunk.platforms_near(x0, x1))
+        return found
+
+    def obstacles_near(self, x0, x1):
+        found = []
+        for chunk in self.chunks_near(x0, x1):
+            found.extend(chunk.obstacles_near(x0, x1))
+        return found
+        
+    def stream(self, camera_x, deadline):
+        """Evict chunks out of range and build the ones ahead; False if out of time"""
+        current = int(camera_x // ENDLESS_CHUNK_WIDTH)
+        # The view spans at most two chunks, so current + 1 is still on screen
+        first = current - ENDLESS_CHUNKS_BEHIND
+        last = current + 1 + ENDLESS_CHUNKS_AHEAD
+        for index in [i for i in self.chunks if i < first or i > last]:
+            del self.chunks[index]
+        for index in range(max(0, current), last + 1):
+            if index not in self.chunks:
+                if time.perf_counter() >= deadline:
+                    return False
+                self.chunk(index)
+        return True
+
+class BuildingLayers:
+    """Parallax skyline pre-rendered into LRU-cached strip tiles, one per layer, strip and decay bucket"""
+
+    def __init__(self, buildings, max_tiles=MAX_BUILDING_TILES):
+        self.indexes = [SpatialIndex([b for b in buildings if b.layer == layer], lambda b: (b.x, b.width))
+                        for layer in range(len(PARALLAX_FACTORS))]
+        self.max_tiles = max_tiles
+        self.tiles = OrderedDict()
+        
+    def tile(self, layer, index, bucket):
+        key = (layer, index, bucket)
+        if key in self.tiles:
+            self.tiles.move_to_end(key)
+            return self.tiles[key]
+        
+        x0 = index * BUILDING_TILE_WIDTH
+        # Cracks shift sections up to 2px sideways and windows overhang the right edge
+        buildings = self.buildings_in(layer, x0 - BUILDING_OVERHANG, x0 + BUILDING_TILE_WIDTH + 2)
+        surface = None
+        if buildings:
+            surface = pygame.Surface((BUILDING_TILE_WIDTH, HEIGHT - BUILDING_MIN_Y))
+            surface.fill(COLOR_KEY)
+            surface.set_colorkey(COLOR_KEY)
+            decay_factor = bucket / BUILDING_DECAY_BUCKETS
+            for building in buildings:
+                building.render(surface, building.x - x0, BUILDING_MIN_Y, decay_factor, bucket)
+        
+        self.tiles[key] = surface
+        while len(self.tiles) > self.max_tiles:
+            self.tiles.popitem(last=False)
+        return surface
+
+    def buildings_in(self, layer, x0, x1):
+        return self.indexes[layer].query(x0, x1)
+        
+    def prerender(self, camera_x, decay_factor):
+        bucket = int(decay_factor * BUILDING_DECAY_BUCKETS)
+        for layer, parallax_factor in enumerate(PARALLAX_FACTORS):
+            offset = camera_x * parallax_factor
+            for index in range(int(offset // BUILDING_TILE_WIDTH), int((offset + WIDTH) // BUILDING_TILE_WIDTH) + 1):
+                self.tile(layer, index, bucket)
+        
+    def prefetch(self, camera_x, decay_factor, deadline):
+        """Render the strips about to scroll into view, stopping at deadline"""
+        bucket = int(decay_factor * BUILDING_DECAY_BUCKETS)
+        for layer, parallax_factor in enumerate(PARALLAX_FACTORS):
+            index = int((camera_x * parallax_factor + WIDTH) // BUILDING_TILE_WIDTH) + 1
+            if (layer, index, bucket) not in self.tiles:
+                if time.perf_counter() >= deadline:
+                    return
+                self.tile(layer, index, bucket)
+        
+    def draw(self, screen, camera, decay_factor):
+        bucket = int(decay_factor * BUILDING_DECAY_BUCKETS)
+        for layer, parallax_factor in enumerate(PARALLAX_FACTORS):
+            offset = camera.x * parallax_factor
+            first = int(offset // BUILDING_TILE_WIDTH)
+            last = int((offset + WIDTH) // BUILDING_TILE_WIDTH)
+            for index in range(first, last + 1):
+                surface = self.tile(layer, index, bucket)
+                if surface is not None:
+                    screen.blit(surface, (int(index * BUILDING_TILE_WIDTH - offset), BUILDING_MIN_Y))
+
+class EndlessSkyline(BuildingLayers):
+    """Skyline whose buildings are generated per strip from the seed, so strips can be dropped freely"""
+
+    def __init__(self, seed, max_tiles=MAX_BUILDING_TILES):
+        super().__init__([], max_tiles)
+        self.seed = seed
+        self.strips = OrderedDict()
+        
+    def strip(self, layer, index):
+        key = (layer, index)
+        if key in self.strips:
+            self.strips.move_to_end(key)
+            return self.strips[key]
+        
+        rng = random.Random((self.seed * len(PARALLAX_FACTORS) + layer) * 1000003 + index)
+        x0 = index * BUILDING_TILE_WIDTH
+        buildings = []
+        for _ in range(rng.randint(0, 2 + layer)):
+            x = x0 + rng.randint(0, BUILDING_TILE_WIDTH - 1)
+            y = rng.randint(BUILDING_MIN_Y, 400)
+            width = rng.randint(80, 200)
+            height = rng.randint(HEIGHT - y - 50, HEIGHT - y + 100)
+            building_type = rng.choice(['tall', 'wide', 'square'])
+            buildings.append(Building(x, y, width, height, layer, building_type))
+        
+        self.strips[key] = buildings
+        while len(self.strips) > self.max_tiles * 2:
+            self.strips.popitem(last=False)
+        return buildings
+        
+    def buildings_in(self, layer, x0, x1):
+        found = []
+        # Buildings start in their own strip and are narrower than one
+        for index in range(max(0, int(x0 // BUILDING_TILE_WIDTH) - 1), int(x1 // BUILDING_TILE_WIDTH) + 1):
+            found.extend(b for b in self.strip(layer, index) if b.x + b.width >= x0 and b.x <= x1)
+        return found
 
-        if height != 50:
-            y = max(min_y, min(max_y, y))
+_landing_arcs = {}
 
-        platform.data['width'] = width
-        platform.data['y'] = y
+def landing_arcs(top, height=PLAYER_SIZE):
+    """Feet before and after each falling tick of a jump and a walk-off from ``top``, stepped as Player.update does"""
+    key = (top, height)
+    if key not in _landing_arcs:
+        arcs = []
+        for vel_y in (-JUMP_STRENGTH, 0):
+            y = top - height
+            tick = 0
+            prev_feet = []
+            feet = []
+            ticks = []
+            while y + height <= HEIGHT - 50:
+                tick += 1
+                before = y + height
+                vel_y += GRAVITY
+                y += vel_y
+                if vel_y > 0:
+                    prev_feet.append(before)
+                    feet.append(y + height)
+                    ticks.append(tick)
+            arcs.append((prev_feet, feet, ticks))
+        _landing_arcs[key] = arcs
+    return _landing_arcs[key]
 
-        if last_end_x is not None:
-            gap = x - last_end_x
-            if gap > max_gap:
-                bridge_x = last_end_x + max_gap
-                bridge_y = y if last_y is None else int((y + last_y) / 2)
-                bridge_y = max(min_y, min(max_y, bridge_y))
-                safe_platforms.append(Platform(bridge_x, bridge_y, min_width, 20, 'grass'))
+def can_land(source, target, width=PLAYER_SIZE, height=PLAYER_SIZE):
+    """Whether some jump or walk-off from ``source`` (None for the ground) lands on ``target``"""
+    if source is None:
+        top = HEIGHT - 50
+        # The ground runs under everything, so no sideways travel is needed
+        need = float('-inf')
+    else:
+        top = source['y']
+        need = max(source['x'] - width - (target['x'] + target['width']),
+                   target['x'] - width - (source['x'] + source['width']))
+    for prev_feet, feet, ticks in landing_arcs(top, height):
+        # Same swept test as Player.update: the tick's fall crosses into the band
+        lo = bisect_right(feet, target['y'])
+        hi = bisect_left(prev_feet, target['y'] + LANDING_BAND)
+        if lo < hi and PLAYER_SPEED * ticks[hi - 1] > need:
+            return True
+    return False
 
-        safe_platforms.append(platform)
-        last_end_x = platform.data['x'] + platform.data['width']
-        last_y = platform.data['y']
+def reachable_platforms(platforms, width=PLAYER_SIZE, height=PLAYER_SIZE):
+    """Indexes of the platforms a player starting on the ground can land on"""
+    rows = [p.data for p in platforms]
+    # The ground is kept out of the bisect window; it is reached from the start anyway
+    index = SpatialIndex(range(len(rows)), lambda i: (rows[i]['x'], rows[i]['width']))
+    
+    reached = set()
+    queue = []
+    for i, row in enumerate(rows):
+        if row['y'] >= HEIGHT - 50 or can_land(None, row, width, height):
+            reached.add(i)
+            queue.append(i)
+    
+    while queue:
+        source = rows[queue.pop()]
+        # Nothing lands further away than the longest fall from this height
+        reach = max((ticks[-1] for _, _, ticks in landing_arcs(source['y'], height) if ticks), default=0) * PLAYER_SPEED
+        for i in index.query(source['x'] - width - reach, source['x'] + source['width'] + width + reach):
+            if i not in reached and can_land(source, rows[i], width, height):
+                reached.add(i)
+                queue.append(i)
+    return reached
 
-    return safe_platforms
+def repair_reachability(platforms, min_width=max(90, PLAYER_SIZE + 20)):
+    """Prop up unreachable platforms with steps below them, lowest first; returns the steps added"""
+    added = []
+    propped = set()
+    while True:
+        reached = reachable_platforms(platforms)
+        missing = [p for i, p in enumerate(platforms) if i not in reached and id(p) not in propped]
+        if not missing:
+            return added
+        target = max(missing, key=lambda p: p.data['y'])
+        propped.add(id(target))
+        step_y = min(PLATFORM_MAX_Y, target.data['y'] + STEP_RISE)
+        if step_y <= target.data['y']:
+            continue
+        step = Platform(target.data['x'], step_y, min_width, 20, 'grass')
+        platforms.append(step)
+        added.append(step)
+
+def normalize_platforms(platforms):
+    min_width = max(90, PLAYER_SIZE + 20)
+    
+    for platform in platforms:
+        platform.data['width'] = max(min_width, platform.data['width'])
+        if platform.data['height'] != 50:
+            platform.data['y'] = max(PLATFORM_MIN_Y, min(PLATFORM_MAX_Y, platform.data['y']))
+    
+    platforms.sort(key=lambda p: p.data['x'])
+    return platforms
+
+def ensure_playable_platforms(platforms):
+    platforms = normalize_platforms(platforms)
+    if repair_reachability(platforms):
+        platforms.sort(key=lambda p: p.data['x'])
+    return platforms
+
+def check_levels(num_chunks=1000):
+    """Report unreachable platforms in the level pack and in generated endless chunks"""
+    start = time.perf_counter()
+    failures = 0
+    checked = 0
+    for level_num in sorted(LEVEL_CONFIG):
+        config = LEVEL_CONFIG[level_num]
+        with open(os.path.join(LEVEL_CONFIG.directory, config['file']), 'r') as f:
+            level_data = json.load(f)
+        platforms = [Platform(0, HEIGHT - 50, config['distance'] + 500, 50, 'grass')]
+        platforms = normalize_platforms(platforms + [Platform(*row) for row in level_data['platforms']])
+        reached = reachable_platforms(platforms)
+        missing = [p.data for i, p in enumerate(platforms) if i not in reached]
+        steps = repair_reachability(platforms)
+        remaining = len(platforms) - len(reachable_platforms(platforms))
+        checked += len(platforms)
+        if missing or remaining:
+            where = ', '.join(f"({row['x']}, {row['y']})" for row in missing)
+            print(f"level {level_num}: {len(missing)} unreachable platform(s) at {where}; "
+                  f"{len(steps)} step(s) added, {remaining} still unreachable")
+        if remaining:
+            failures += 1
+    
+    for index in range(num_chunks):
+        platforms, _ = generate_chunk(index, index)
+        remaining = len(platforms) - len(reachable_platforms(platforms))
+        checked += len(platforms)
+        if remaining:
+            failures += 1
+            print(f"endless chunk {index}: {remaining} unreachable platform(s)")
+    
+    elapsed = time.perf_counter() - start
+    print(f"Checked {len(LEVEL_CONFIG)} levels and {num_chunks} endless chunks "
+          f"({checked} platforms) in {elapsed:.2f}s, {failures} with unreachable platforms")
+    return failures == 0
+
+# block_size -> (one pixel per block surface, full-screen surface)
+_static_surfaces = {}
+_static_rng = np.random.default_rng() if np is not None else None
+_static_palette = np.array([(g, g, g) for g in STATIC_GRAYS] + [COLOR_KEY], dtype=np.uint8) if np is not None else None
 
 def draw_8bit_static(screen, intensity, block_size=8):
     if intensity <= 0:
         return
     
+    if np is not None:
+        # Roll the whole block grid at once, then scale it up in a single blit
+        cols = -(-WIDTH // block_size)
+        rows = -(-HEIGHT // block_size)
+        if block_size not in _static_surfaces:
+            small = pygame.Surface((cols, rows))
+            big = pygame.Surface((cols * block_size, rows * block_size))
+            big.set_colorkey(COLOR_KEY)
+            _static_surfaces[block_size] = (small, big)
+        small, big = _static_surfaces[block_size]
+        
+        shades = _static_rng.integers(0, len(STATIC_GRAYS), (cols, rows))
+        visible = _static_rng.random((cols, rows)) < intensity * 0.6
+        pygame.surfarray.blit_array(small, _static_palette[np.where(visible, shades, len(STATIC_GRAYS))])
+        pygame.transform.scale(small, big.get_size(), big)
+        screen.blit(big, (0, 0))
+        return
+    
     for x in range(0, WIDTH, block_size):
         for y in range(0, HEIGHT, block_size):
             if random.random() < intensity * 0.6:
                 gray = random.choice([0, 64, 128, 192, 255])
                 pygame.draw.rect(screen, (gray, gray, gray), (x, y, block_size, block_size))
 
-def create_level(level_num):
-    """Create fixed, hand-designed levels that progressively get harder"""
+def glitch_post_process(screen, intensity):
+    """Tear, shift and quantize the finished frame in place; needs numpy"""
+    if intensity <= GLITCH_MIN_INTENSITY:
+        return
+    
+    width, height = screen.get_size()
+    rng = _static_rng
+    if screen.get_bytesize() == 4:
+        pixels = pygame.surfarray.pixels2d(screen)
+    else:
+        pixels = pygame.surfarray.pixels3d(screen)
+    
+    # Scanline displacement: thin horizontal bands torn sideways
+    num_bands = int(3 + intensity * 12)
+    max_shift = max(4, int(intensity * intensity * 40))
+    band_ys = rng.integers(0, height, num_bands).tolist()
+    band_heights = rng.integers(2, 10, num_bands).tolist()
+    shifts = (rng.integers(-max_shift, max_shift + 1, num_bands) // 4 * 4).tolist()
+    for band_y, band_height, shift in zip(band_ys, band_heights, shifts):
+        band = pixels[:, band_y:band_y + band_height]
+        band[...] = np.roll(band, shift, axis=0)
+    
+    # Block shifts: rectangles copied over from a nearby offset
+    num_blocks = int(2 + intensity * 6)
+    max_offset = int(intensity * intensity * 20)
+    sizes = np.column_stack((rng.integers(32, 160, num_blocks), rng.integers(8, 40, num_blocks)))
+    corners = (rng.random((num_blocks, 2)) * ((width, height) - sizes)).astype(int)
+    sources = np.clip(corners + rng.integers(-max_offset, max_offset + 1, (num_blocks, 2)), 0, (width, height) - sizes)
+    for (w, h), (x, y), (src_x, src_y) in zip(sizes.tolist(), corners.tolist(), sources.tolist()):
+        pixels[x:x + w, y:y + h] = pixels[src_x:src_x + w, src_y:src_y + h]
+    
+    # Colour quantization: drop more low bits per channel as intensity rises
+    keep = (0xFF << (1 + int(intensity * 4))) & 0xFF
+    if pixels.ndim == 2:
+        # Clear the dropped bits of each colour channel wherever the format puts it, leaving alpha alone
+        dropped = sum((~keep & 0xFF) << shift for shift in screen.get_shifts()[:3])
+        pixels &= np.uint32(~dropped & 0xFFFFFFFF)
+    else:
+        pixels &= np.uint8(keep)
+    del pixels
+
+def compile_level(level_data, distance):
+    platforms = [Platform(0, HEIGHT - 50, distance + 500, 50, 'grass')]
+    platforms.extend(Platform(*row) for row in level_data['platforms'])
+    platforms = ensure_playable_platforms(platforms)
+    platform_rows = [[p.data['x'], p.data['y'], p.data['width'], p.data['height'], p.data['type']]
+                     for p in platforms]
+    return platform_rows, level_data['obstacles']
+
+def create_level(level_num, rng=random):
+    """Build a level from its pack data, with freshly generated buildings"""
     config = LEVEL_CONFIG[level_num]
     distance = config['distance']
+    platform_rows, obstacle_rows = LEVEL_CONFIG.geometry(level_num)
     
-    platforms = []
-    obstacles = []
+    platforms = [Platform(*row) for row in platform_rows]
+    obstacles = [Obstacle(*row) for row in obstacle_rows]
     buildings = []
     
-    # Ground platform
-    platforms.append(Platform(0, HEIGHT - 50, distance + 500, 50, 'grass'))
-    
-    # LEVEL DESIGNS - Each is carefully crafted
-    if level_num == 1:
-        # Tutorial level - easy jumps
-        platforms.extend([
-            Platform(300, 500, 120, 20, 'grass'),
-            Platform(500, 450, 120, 20, 'grass'),
-            Platform(750, 400, 150, 20, 'grass'),
-            Platform(1000, 350, 120, 20, 'grass'),
-            Platform(1250, 400, 150, 20, 'grass'),
-            Platform(1550, 450, 120, 20, 'grass'),
-            Platform(1800, 500, 120, 20, 'grass'),
-        ])
-        obstacles.extend([
-            Obstacle(650, HEIGHT - 82, 24, 32),
-            Obstacle(1400, HEIGHT - 82, 24, 32),
-        ])
-        
-    elif level_num == 2:
-        # Introduce longer jumps
-        platforms.extend([
-            Platform(250, 480, 100, 20, 'grass'),
-            Platform(450, 420, 100, 20, 'grass'),
-            Platform(700, 380, 120, 20, 'grass'),
-            Platform(950, 340, 100, 20, 'grass'),
-            Platform(1200, 380, 120, 20, 'grass'),
-            Platform(1450, 440, 100, 20, 'grass'),
-            Platform(1700, 400, 120, 20, 'grass'),
-            Platform(1950, 460, 120, 20, 'grass'),
-        ])
-        obstacles.extend([
-            Obstacle(600, HEIGHT - 82, 24, 32),
-            Obstacle(850, 300, 24, 32),
-            Obstacle(1600, 360, 24, 32),
-        ])
-        
-    elif level_num == 3:
-        # Tighter platforming
-        platforms.extend([
-            Platform(200, 500, 80, 20, 'grass'),
-            Platform(350, 440, 80, 20, 'grass'),
-            Platform(520, 380, 80, 20, 'grass'),
-            Platform(690, 320, 100, 20, 'grass'),
-            Platform(900, 280, 80, 20, 'grass'),
-            Platform(1100, 340, 100, 20, 'grass'),
-            Platform(1320, 400, 80, 20, 'grass'),
-            Platform(1520, 360, 100, 20, 'grass'),
-            Platform(1750, 420, 80, 20, 'grass'),
-            Platform(1950, 480, 100, 20, 'grass'),
-            Platform(2200, 440, 120, 20, 'grass'),
-        ])
-        obstacles.extend([
-            Obstacle(450, 400, 24, 32),
-            Obstacle(800, 280, 24, 32),
-            Obstacle(1420, 360, 24, 32),
-            Obstacle(2100, HEIGHT - 82, 24, 32),
-        ])
-        
-    elif level_num == 4:
-        # HARD - No deaths allowed, precise jumps
-        platforms.extend([
-            Platform(180, 520, 90, 20, 'grass'),
-            Platform(340, 460, 70, 20, 'grass'),
-            Platform(490, 400, 80, 20, 'grass'),
-            Platform(660, 340, 70, 20, 'grass'),
-            Platform(820, 280, 90, 20, 'grass'),
-            Platform(1000, 240, 80, 20, 'grass'),
-            Platform(1190, 300, 70, 20, 'grass'),
-            Platform(1350, 360, 90, 20, 'grass'),
-            Platform(1540, 320, 80, 20, 'grass'),
-            Platform(1730, 380, 70, 20, 'grass'),
-            Platform(1900, 440, 90, 20, 'grass'),
-            Platform(2100, 400, 80, 20, 'grass'),
-            Platform(2300, 460, 100, 20, 'grass'),
-            Platform(2550, 420, 120, 20, 'grass'),
-        ])
-        obstacles.extend([
-            Obstacle(580, 360, 24, 32),
-            Obstacle(910, 240, 24, 32),
-            Obstacle(1260, 320, 24, 32),
-            Obstacle(1820, 340, 24, 32),
-            Obstacle(2200, 360, 24, 32),
-        ])
-        
-    elif level_num == 5:
-        # Moving up and down rhythm
-        platforms.extend([
-            Platform(250, 520, 100, 20, 'grass'),
-            Platform(450, 450, 90, 20, 'grass'),
-            Platform(640, 380, 100, 20, 'grass'),
-            Platform(840, 320, 90, 20, 'grass'),
-            Platform(1030, 380, 100, 20, 'grass'),
-            Platform(1230, 440, 90, 20, 'grass'),
-            Platform(1420, 380, 100, 20, 'grass'),
-            Platform(1620, 320, 90, 20, 'grass'),
-            Platform(1820, 400, 100, 20, 'grass'),
-            Platform(2050, 480, 120, 20, 'grass'),
-        ])
-        obstacles.extend([
-            Obstacle(550, 410, 24, 32),
-            Obstacle(930, 280, 24, 32),
-            Obstacle(1520, 340, 24, 32),
-            Obstacle(1920, 360, 24, 32),
-        ])
-        
-    elif level_num == 6:
-        # Longer jumps, requires momentum
-        platforms.extend([
-            Platform(220, 500, 110, 20, 'grass'),
-            Platform(480, 440, 90, 20, 'grass'),
-            Platform(750, 380, 100, 20, 'grass'),
-            Platform(1050, 320, 90, 20, 'grass'),
-            Platform(1350, 280, 110, 20, 'grass'),
-            Platform(1650, 340, 90, 20, 'grass'),
-            Platform(1920, 400, 100, 20, 'grass'),
-            Platform(2200, 360, 110, 20, 'grass'),
-            Platform(2500, 420, 120, 20, 'grass'),
-            Platform(2800, 480, 120, 20, 'grass'),
-        ])
-        obstacles.extend([
-            Obstacle(380, HEIGHT - 82, 24, 32),
-            Obstacle(850, 340, 24, 32),
-            Obstacle(1540, 300, 24, 32),
-            Obstacle(2100, 360, 24, 32),
-            Obstacle(2700, 440, 24, 32),
-        ])
-        
-    elif level_num == 7:
-        # HARD - Tight technical platforming
-        platforms.extend([
-            Platform(200, 520, 80, 20, 'grass'),
-            Platform(350, 460, 70, 20, 'grass'),
-            Platform(500, 400, 80, 20, 'grass'),
-            Platform(660, 340, 70, 20, 'grass'),
-            Platform(810, 280, 80, 20, 'grass'),
-            Platform(980, 240, 70, 20, 'grass'),
-            Platform(1140, 200, 80, 20, 'grass'),
-            Platform(1310, 260, 70, 20, 'grass'),
-            Platform(1470, 320, 80, 20, 'grass'),
-            Platform(1640, 280, 70, 20, 'grass'),
-            Platform(1800, 340, 80, 20, 'grass'),
-            Platform(1970, 400, 70, 20, 'grass'),
-            Platform(2140, 360, 80, 20, 'grass'),
-            Platform(2320, 420, 70, 20, 'grass'),
-            Platform(2500, 380, 80, 20, 'grass'),
-            Platform(2680, 440, 90, 20, 'grass'),
-            Platform(2900, 490, 120, 20, 'grass'),
-        ])
-        obstacles.extend([
-            Obstacle(430, 420, 24, 32),
-            Obstacle(730, 300, 24, 32),
-            Obstacle(1070, 200, 24, 32),
-            Obstacle(1550, 280, 24, 32),
-            Obstacle(2050, 360, 24, 32),
-            Obstacle(2600, 400, 24, 32),
-        ])
-        
-    elif level_num == 8:
-        # Speed challenge - wider platforms but more obstacles
-        platforms.extend([
-            Platform(250, 500, 140, 20, 'grass'),
-            Platform(500, 450, 130, 20, 'grass'),
-            Platform(750, 400, 140, 20, 'grass'),
-            Platform(1000, 350, 130, 20, 'grass'),
-            Platform(1280, 400, 140, 20, 'grass'),
-            Platform(1550, 450, 130, 20, 'grass'),
-            Platform(1820, 400, 140, 20, 'grass'),
-            Platform(2100, 450, 150, 20, 'grass'),
-            Platform(2400, 500, 140, 20, 'grass'),
-        ])
-        obstacles.extend([
-            Obstacle(350, 460, 24, 32),
-            Obstacle(600, 410, 24, 32),
-            Obstacle(850, 360, 24, 32),
-            Obstacle(1100, 310, 24, 32),
-            Obstacle(1380, 360, 24, 32),
-            Obstacle(1650, 410, 24, 32),
-            Obstacle(1920, 360, 24, 32),
-            Obstacle(2200, 410, 24, 32),
-            Obstacle(2500, 460, 24, 32),
-        ])
-        
-    elif level_num == 9:
-        # Epic journey - long level with varied challenges
-        platforms.extend([
-            Platform(230, 510, 100, 20, 'grass'),
-            Platform(420, 460, 90, 20, 'grass'),
-            Platform(600, 410, 100, 20, 'grass'),
-            Platform(800, 360, 90, 20, 'grass'),
-            Platform(1000, 310, 100, 20, 'grass'),
-            Platform(1210, 270, 90, 20, 'grass'),
-            Platform(1420, 230, 100, 20, 'grass'),
-            Platform(1640, 290, 90, 20, 'grass'),
-            Platform(1840, 350, 100, 20, 'grass'),
-            Platform(2050, 310, 90, 20, 'grass'),
-            Platform(2260, 370, 100, 20, 'grass'),
-            Platform(2470, 430, 90, 20, 'grass'),
-            Platform(2680, 380, 100, 20, 'grass'),
-            Platform(2900, 440, 90, 20, 'grass'),
-            Platform(3120, 400, 100, 20, 'grass'),
-            Platform(3350, 460, 120, 20, 'grass'),
-            Platform(3600, 510, 140, 20, 'grass'),
-        ])
-        obstacles.extend([
-            Obstacle(510, 420, 24, 32),
-            Obstacle(890, 320, 24, 32),
-            Obstacle(1300, 230, 24, 32),
-            Obstacle(1730, 310, 24, 32),
-            Obstacle(2150, 270, 24, 32),
-            Obstacle(2560, 390, 24, 32),
-            Obstacle(2990, 400, 24, 32),
-            Obstacle(3450, 420, 24, 32),
-        ])
-        
-    elif level_num == 10:
-        # FINAL HARD LEVEL - Master test
-        platforms.extend([
-            Platform(180, 530, 80, 20, 'grass'),
-            Platform(320, 480, 70, 20, 'grass'),
-            Platform(460, 430, 80, 20, 'grass'),
-            Platform(610, 380, 70, 20, 'grass'),
-            Platform(750, 330, 80, 20, 'grass'),
-            Platform(900, 280, 70, 20, 'grass'),
-            Platform(1050, 240, 80, 20, 'grass'),
-            Platform(1210, 200, 70, 20, 'grass'),
-            Platform(1360, 250, 80, 20, 'grass'),
-            Platform(1520, 300, 70, 20, 'grass'),
-            Platform(1670, 260, 80, 20, 'grass'),
-            Platform(1830, 220, 70, 20, 'grass'),
-            Platform(1990, 280, 80, 20, 'grass'),
-            Platform(2150, 340, 70, 20, 'grass'),
-            Platform(2310, 300, 80, 20, 'grass'),
-            Platform(2480, 360, 70, 20, 'grass'),
-            Platform(2650, 320, 80, 20, 'grass'),
-            Platform(2820, 380, 70, 20, 'grass'),
-            Platform(3000, 440, 80, 20, 'grass'),
-            Platform(3190, 400, 90, 20, 'grass'),
-            Platform(3390, 460, 100, 20, 'grass'),
-        ])
-        obstacles.extend([
-            Obstacle(400, 440, 24, 32),
-            Obstacle(690, 340, 24, 32),
-            Obstacle(990, 240, 24, 32),
-            Obstacle(1300, 210, 24, 32),
-            Obstacle(1610, 270, 24, 32),
-            Obstacle(1920, 230, 24, 32),
-            Obstacle(2240, 310, 24, 32),
-            Obstacle(2570, 330, 24, 32),
-            Obstacle(2910, 390, 24, 32),
-            Obstacle(3290, 410, 24, 32),
-        ])
-    
     # Generate parallax buildings
     for layer in range(3):
         num_buildings = 8 + layer * 4
         for i in range(num_buildings):
-            x = random.randint(100, distance + 500)
-            y = random.randint(150, 400)
-            width = random.randint(80, 200)
-            height = random.randint(HEIGHT - y - 50, HEIGHT - y + 100)
-            building_type = random.choice(['tall', 'wide', 'square'])
+            x = rng.randint(100, distance + 500)
+            y = rng.randint(BUILDING_MIN_Y, 400)
+            width = rng.randint(80, 200)
+            height = rng.randint(HEIGHT - y - 50, HEIGHT - y + 100)
+            building_type = rng.choice(['tall', 'wide', 'square'])
             buildings.append(Building(x, y, width, height, layer, building_type))
     
     # Sort buildings by layer for proper rendering
     buildings.sort(key=lambda b: b.layer)
     
-    platforms = ensure_playable_platforms(platforms)
     playable_platforms = [p for p in platforms if p.data['height'] != 50]
     if playable_platforms:
         last_platform = max(playable_platforms, key=lambda p: p.data['x'] + p.data['width'])
@@ -806,18 +1229,560 @@ def create_level(level_num):
     
     # Set level boundary 200px after the goal ends
     level_end_x = goal_x + goal.width + 200
+    geometry = LevelGeometry(platforms, obstacles)
+    
+    return platforms, obstacles, buildings, goal, level_end_x, geometry
+
+def generate_chunk(seed, index):
+    """Platforms and obstacles for one endless-mode chunk, with hazards denser further in"""
+    rng = random.Random(seed * 1000003 + index)
+    x0 = index * ENDLESS_CHUNK_WIDTH
+    x1 = x0 + ENDLESS_CHUNK_WIDTH
+    difficulty = min(0.8, 0.2 + index * 0.05)
+    min_width = max(90, PLAYER_SIZE + 20)
+    
+    platforms = [Platform(x0, HEIGHT - 50, ENDLESS_CHUNK_WIDTH, 50, 'grass')]
+    obstacles = []
+    
+    # Keep the respawn point at the start of the chunk clear
+    safe_x = x0 + ENDLESS_SPAWN_OFFSET + 150
+    x = safe_x + rng.randint(0, 100)
+    y = rng.randint(360, 520)
+    while True:
+        width = rng.randint(min_width, 220)
+        if x + width > x1 - 60:
+            break
+        if len(platforms) > 1 and rng.random() < difficulty:
+            prev = platforms[-1].data
+            gap_x = prev['x'] + prev['width']
+            obstacles.append(Obstacle((gap_x + x) // 2 - 12, min(prev['y'], y) - 40, 24, 32))
+        platforms.append(Platform(x, y, width, 20, 'grass'))
+        x += width + rng.randint(60, 180)
+        y = max(PLATFORM_MIN_Y, min(PLATFORM_MAX_Y, y + rng.randint(-80, 80)))
+    repair_reachability(platforms)
+    
+    for ground_x in range(safe_x, x1 - 200, 400):
+        if rng.random() < difficulty * 0.5:
+            obstacles.append(Obstacle(ground_x + rng.randint(0, 100), HEIGHT - 50 - 32, 24, 32))
+    
+    return platforms, obstacles
+
+def read_keyboard_inputs():
+    keys = pygame.key.get_pressed()
+    inputs = 0
+    if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+        inputs |= INPUT_LEFT
+    if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+        inputs |= INPUT_RIGHT
+    return inputs
+
+class GameSession:
+    """One attempt at a level, advanced tick by tick from INPUT_* bitmasks; needs no display"""
+
+    def __init__(self, level_num, sprites=None, seed=None):
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.seed = seed
+        self.level_rng = random.Random(seed)
+        self.effect_rng = random.Random(seed ^ 0x5EED)
+        self.input_log = bytearray()
+        self.level_num = level_num
+        self.build_world()
+        # Feet start on the ground (sprites are scaled to PLAYER_SIZE too)
+        self.player = Player(50, HEIGHT - 50 - PLAYER_SIZE, sprites)
+        self.player.max_x = self.level_end_x
+        self.camera = Camera()
+        self.death_chunks = DeathChunkOverlay()
+        self.ticks = 0
+        self.elapsed_time = 0
+        self.decay_factor = 0
+        self.glitch_intensity = 0
+        self.static_intensity = 0
+        self.game_over = False
+        self.won = False
+        self.final_time = 0
+        self.stars = 0
+
+    def build_world(self):
+        self.config = LEVEL_CONFIG[self.level_num]
+        (self.platforms, self.obstacles, self.buildings, self.goal,
+         self.level_end_x, self.geometry) = create_level(self.level_num, self.level_rng)
+        self.skyline = BuildingLayers(self.buildings)
+
+    def step(self, inputs=0, ticks=1):
+        """Advance ``ticks`` fixed ticks holding ``inputs``"""
+        for _ in range(ticks):
+            if self.game_over:
+                return
+            self.advance(inputs)
+
+    def advance(self, inputs):
+        player = self.player
+        self.ticks += 1
+        self.input_log.append(inputs)
+
+        if inputs & INPUT_JUMP:
+            player.jump()
+
+        # Only shapes within one step of the player can touch it this tick
+        reach_x0 = player.x - PLAYER_SPEED
+        reach_x1 = player.x + player.width + PLAYER_SPEED
+        player.update([p.data for p in self.geometry.platforms_near(reach_x0, reach_x1)], inputs)
+        self.camera.update(player)
+
+        now_ms = self.ticks * SIM_STEP_MS
+        self.death_chunks.expire(now_ms)
+        self.elapsed_time = now_ms / 1000
+        self.update_effects()
+
+        sweep_x0 = min(player.prev_x, player.x)
+        sweep_x1 = max(player.prev_x, player.x) + player.width
+        for obstacle in self.geometry.obstacles_near(sweep_x0, sweep_x1):
+            if obstacle.check_sweep(player):
+                player.lives -= 1
+                player.deaths += 1
+
+                rng = self.effect_rng
+                num_chunks = rng.randint(2, 3)
+                for _ in range(num_chunks):
+                    chunk_width = rng.randint(100, 180)
+                    chunk_height = rng.randint(80, 140)
+                    chunk_x = rng.randint(0, WIDTH - chunk_width)
+                    chunk_y = rng.randint(0, HEIGHT - chunk_height)
+                    chunk_seed = rng.getrandbits(32)
+                    self.death_chunks.add(DeathChunk(chunk_x, chunk_y, chunk_width, chunk_height, now_ms, chunk_seed))
+
+                player.reset()
+
+                if player.lives <= 0:
+                    self.game_over = True
+                    self.final_time = int(self.elapsed_time)
+
+        self.check_finished()
+
+    def time_remaining(self):
+        return max(0, self.config['time'] - self.elapsed_time)
+
+    def update_effects(self):
+        distance_decay = min(1.0, self.player.furthest_x / self.config['distance'])
+        self.decay_factor = distance_decay
+        self.glitch_intensity = distance_decay
+
+        time_remaining = self.time_remaining()
+        if time_remaining <= 15:
+            self.static_intensity = (15 - time_remaining) / 15.0
+        else:
+            self.static_intensity = 0
+
+    def check_finished(self):
+        self.goal.update()
+        if self.goal.check_collision(self.player):
+            self.won = True
+            self.game_over = True
+            self.final_time = int(self.elapsed_time)
+            self.stars = calculate_stars(self.level_num, self.final_time, self.player.deaths)
+
+        if self.time_remaining() <= 0:
+            self.game_over = True
+            self.final_time = self.config['time']
+
+    def stream(self, budget_ms=STREAM_BUDGET_MS):
+        """Spend up to budget_ms getting ahead on world work for coming frames"""
+        deadline = time.perf_counter() + budget_ms / 1000
+        self.skyline.prefetch(self.camera.x, self.decay_factor, deadline)
+
+    def display_time(self):
+        if self.game_over:
+            return self.final_time
+        return int(self.time_remaining())
+
+    def hud_label(self):
+        return f"LEVEL {self.level_num}"
+
+    def draw(self, screen, alpha=1.0, profiler=None, dt_ms=0):
+        decay_factor = self.decay_factor
+        glitch_intensity = self.glitch_intensity
+        view = self.camera.interpolated(alpha)
+        mark = profiler.mark if profiler is not None else (lambda phase: None)
+
+        # Draw with parallax
+        sky_intensity = int(228 * (1 - decay_factor * 0.8))
+        sky_color = (int(95 * (1 - decay_factor * 0.5)), 
+                    int(205 * (1 - decay_factor * 0.6)), 
+                    sky_intensity)
+        screen.fill(sky_color)
+
+        # Draw buildings (parallax background)
+        self.skyline.draw(screen, view, decay_factor)
+        mark('buildings')
+
+        # With numpy the glitch is one pass over the finished frame, so entities draw clean
+        entity_glitch = glitch_intensity if np is None else 0
+
+        # Glitch fragments and obstacles are collected and sent to SDL in one call
+        view_x0 = view.x - CULL_MARGIN
+        view_x1 = view.x + WIDTH + CULL_MARGIN
+        fragments = []
+        for platform in self.geometry.platforms_near(view_x0, view_x1):
+            platform.draw(screen, view, decay_factor, entity_glitch, fragments)
+        mark('platforms')
+
+        for obstacle in self.geometry.obstacles_near(view_x0, view_x1):
+            obstacle.draw(screen, view, decay_factor, entity_glitch, fragments)
+        screen.blits(fragments, False)
+        mark('obstacles')
+
+        if self.goal is not None:
+            self.goal.draw(screen, view, decay_factor)
+        self.player.draw(screen, view, decay_factor, alpha, dt_ms)
+        mark('player')
+
+        if np is not None:
+            glitch_post_process(screen, glitch_intensity)
+        mark('glitch')
+
+        self.death_chunks.draw(screen, self.ticks * SIM_STEP_MS)
+        mark('death_chunks')
+
+        if self.static_intensity > 0:
+            draw_8bit_static(screen, self.static_intensity, 8)
+        mark('static')
+
+class EndlessSession(GameSession):
+    """A run with no goal or timer through a world streamed in around the camera"""
+
+    def __init__(self, sprites=None, seed=None):
+        super().__init__(ENDLESS_LEVEL, sprites, seed)
+
+    def build_world(self):
+        self.config = None
+        self.geometry = EndlessWorld(self.seed)
+        self.skyline = EndlessSkyline(self.seed)
+        self.goal = None
+        self.level_end_x = None
+        self.checkpoint = 0
+
+    def update_effects(self):
+        distance = self.player.furthest_x
+        self.decay_factor = distance / (distance + ENDLESS_DECAY_DISTANCE)
+        self.glitch_intensity = self.decay_factor
+        self.static_intensity = max(0, self.decay_factor - 0.75) * 4
+
+    def check_finished(self):
+        player = self.player
+        index = int(player.x - ENDLESS_SPAWN_OFFSET) // ENDLESS_CHUNK_WIDTH
+        if index > self.checkpoint:
+            self.checkpoint = index
+            player.start_x = index * ENDLESS_CHUNK_WIDTH + ENDLESS_SPAWN_OFFSET
+            player.start_y = HEIGHT - 50 - player.height
+
+    def stream(self, budget_ms=STREAM_BUDGET_MS):
+        deadline = time.perf_counter() + budget_ms / 1000
+        if self.geometry.stream(self.camera.x, deadline):
+            self.skyline.prefetch(self.camera.x, self.decay_factor, deadline)
+
+    def display_time(self):
+        if self.game_over:
+            return self.final_time
+        return int(self.elapsed_time)
+
+    def distance(self):
+        return int(self.player.furthest_x) // 10
+
+    def hud_label(self):
+        return f"{self.distance()}m"
+
+class AgentBatch:
+    """Many players advanced together through one pack level, matching GameSession.advance exactly; needs numpy"""
+
+    def __init__(self, session, count):
+        if np is None:
+            raise RuntimeError("AgentBatch needs numpy")
+        if session.goal is None:
+            raise ValueError("AgentBatch only runs levels with a goal")
+        self.platforms, obstacles = session.geometry.as_arrays()
+        # In the x order GameSession meets them, which matters when one hit follows another
+        self.obstacles = obstacles[:, np.argsort(obstacles[0], kind='stable')]
+        self.goal = session.goal
+        self.time_limit = session.config['time']
+        self.max_x = session.player.max_x
+        player = session.player
+        self.width = player.width
+        self.height = player.height
+        self.start_x = player.start_x
+        self.start_y = player.start_y
+        
+        self.x = np.full(count, player.x, dtype=np.float64)
+        self.y = np.full(count, player.y, dtype=np.float64)
+        self.prev_x = self.x.copy()
+        self.prev_y = self.y.copy()
+        self.vel_y = np.full(count, float(player.vel_y))
+        self.on_ground = np.full(count, player.on_ground)
+        self.furthest_x = self.x.copy()
+        self.lives = np.full(count, player.lives)
+        self.deaths = np.zeros(count, dtype=np.int64)
+        self.won = np.zeros(count, dtype=bool)
+        self.game_over = np.zeros(count, dtype=bool)
+        self.ticks = np.zeros(count, dtype=np.int64)
+        
+        # Obstacles overlapping the spawn point hit again straight after a reset
+        ox, oy, ow, oh = self.obstacles
+        self.spawn_hits = ((self.start_x + self.width > ox) & (self.start_x < ox + ow) &
+                           (self.start_y + self.height > oy) & (self.start_y < oy + oh))
+
+    def step(self, inputs):
+        """Advance every agent that is still playing by one tick; inputs is one INPUT_* mask per agent"""
+        inputs = np.broadcast_to(np.asarray(inputs, dtype=np.uint8), self.x.shape)
+        active = ~self.game_over
+        self.ticks += active
+        
+        jumping = active & ((inputs & INPUT_JUMP) != 0) & self.on_ground
+        self.vel_y[jumping] = -JUMP_STRENGTH
+        
+        # Player.update
+        self.prev_x = np.where(active, self.x, self.prev_x)
+        self.prev_y = np.where(active, self.y, self.prev_y)
+        x = self.x - np.where(active & ((inputs & INPUT_LEFT) != 0), PLAYER_SPEED, 0)
+        x = x + np.where(active & ((inputs & INPUT_RIGHT) != 0), PLAYER_SPEED, 0)
+        self.furthest_x = np.maximum(self.furthest_x, x)
+        
+        prev_feet = self.y + self.height
+        vel_y = np.where(active, self.vel_y + GRAVITY, self.vel_y)
+        y = np.where(active, self.y + vel_y, self.y)
+        feet = y + self.height
+        
+        px, py, pw, _ = self.platforms
+        crossing = ((x[:, None] + self.width > px) & (x[:, None] < px + pw) &
+                    (feet[:, None] > py) & (prev_feet[:, None] < py + LANDING_BAND) &
+                    (active & (vel_y > 0))[:, None])
+        landing_y = np.where(crossing, py, np.inf).min(axis=1)
+        landed = np.isfinite(landing_y)
+        y = np.where(landed, landing_y - self.height, y)
+        vel_y = np.where(landed, 0.0, vel_y)
+        on_ground = np.where(active, landed, self.on_ground)
+        
+        floor = active & (y + self.height > HEIGHT - 50)
+        y = np.where(floor, HEIGHT - 50 - self.height, y)
+        vel_y = np.where(floor, 0.0, vel_y)
+        on_ground |= floor
+        
+        x = np.where(x < 0, 0, x)
+        if self.max_x is not None:
+            x = np.where(x + self.width > self.max_x, self.max_x - self.width, x)
+        self.x, self.y, self.vel_y, self.on_ground = x, y, vel_y, on_ground
+        
+        # Obstacle.check_sweep for every agent against every obstacle
+        hits = active[:, None] & self.sweep_hits()
+        hit = hits.any(axis=1)
+        if hit.any():
+            first = hits.argmax(axis=1)
+            later = np.arange(hits.shape[1])[None, :] > first[:, None]
+            count = np.where(hit, 1 + (later & self.spawn_hits[None, :]).sum(axis=1), 0)
+            self.lives -= count
+            self.deaths += count
+            self.x = np.where(hit, float(self.start_x), self.x)
+            self.y = np.where(hit, float(self.start_y), self.y)
+            self.prev_x = np.where(hit, self.x, self.prev_x)
+            self.prev_y = np.where(hit, self.y, self.prev_y)
+            self.vel_y = np.where(hit, 0.0, self.vel_y)
+            self.game_over |= hit & (self.lives <= 0)
+        
+        # GameSession.check_finished
+        goal = self.goal
+        at_goal = active & ((self.x + self.width > goal.x) & (self.x < goal.x + goal.width) &
+                            (self.y + self.height > goal.y) & (self.y < goal.y + goal.height))
+        self.won |= at_goal
+        self.game_over |= at_goal
+        elapsed = self.ticks * SIM_STEP_MS / 1000
+        self.game_over |= active & (np.maximum(0, self.time_limit - elapsed) <= 0)
+        
+    def sweep_hits(self):
+        t_enter = np.zeros((len(self.x), self.obstacles.shape[1]))
+        t_exit = np.ones_like(t_enter)
+        overlap = np.ones(t_enter.shape, dtype=bool)
+        ox, oy, ow, oh = self.obstacles
+        for start, end, size, lo, span in ((self.prev_x, self.x, self.width, ox, ow),
+                                           (self.prev_y, self.y, self.height, oy, oh)):
+            start = start[:, None]
+            delta = (end - start[:, 0])[:, None]
+            still = delta == 0
+            overlap &= ~still | ((start + size > lo) & (start < lo + span))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                t0 = (lo - size - start) / delta
+                t1 = (lo + span - start) / delta
+            t_enter = np.where(still, t_enter, np.maximum(t_enter, np.minimum(t0, t1)))
+            t_exit = np.where(still, t_exit, np.minimum(t_exit, np.maximum(t0, t1)))
+        return overlap & (t_enter < t_exit)
+
+def new_session(level_num, sprites=None, seed=None):
+    if level_num == ENDLESS_LEVEL:
+        return EndlessSession(sprites, seed)
+    return GameSession(level_num, sprites, seed)
+
+def build_session(level_num, sprites=None):
+    session = new_session(level_num, sprites)
+    session.skyline.prerender(session.camera.x, session.decay_factor)
+    return session
+
+class LevelLoader:
+    """Builds sessions on a worker thread, ahead of time where possible"""
+
+    def __init__(self, sprites=None):
+        self.sprites = sprites
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.futures = OrderedDict()
+        
+    def prefetch(self, level_num):
+        if level_num not in self.futures:
+            self.futures[level_num] = self.executor.submit(build_session, level_num, self.sprites)
+            while len(self.futures) > MAX_PREFETCHED_LEVELS:
+                _, stale = self.futures.popitem(last=False)
+                stale.cancel()
+        return self.futures[level_num]
+        
+    def take(self, level_num):
+        future = self.prefetch(level_num)
+        del self.futures[level_num]
+        return future
+        
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+class FrameProfiler:
+    """Per-phase timings for the last ``capacity`` PLAYING frames, kept in a fixed ring buffer"""
+
+    def __init__(self, capacity=600):
+        self.capacity = capacity
+        self.frames = [None] * capacity
+        self.count = 0
+        self.current = None
+        self.last = 0
+        self.visible = False
+        self.overlay = None
+        
+    def begin_frame(self):
+        self.current = dict.fromkeys(PROFILE_PHASES, 0.0)
+        self.last = time.perf_counter()
+        
+    def mark(self, phase):
+        if self.current is None:
+            return
+        now = time.perf_counter()
+        self.current[phase] += (now - self.last) * 1000
+        self.last = now
+        
+    def end_frame(self):
+        if self.current is None:
+            return
+        self.frames[self.count % self.capacity] = self.current
+        self.count += 1
+        self.current = None
+        # The overlay text is refreshed a few times a second, not every frame
+        if self.count % 15 == 0:
+            self.overlay = None
+        
+    def recent(self):
+        if self.count <= self.capacity:
+            return self.frames[:self.count]
+        start = self.count % self.capacity
+        return self.frames[start:] + self.frames[:start]
+        
+    def summary(self):
+        frames = self.recent()
+        if not frames:
+            return None
+        totals = sorted(sum(frame.values()) for frame in frames)
+        
+        def percentile(p):
+            return totals[min(len(totals) - 1, int(len(totals) * p / 100))]
+        
+        means = {phase: sum(frame[phase] for frame in frames) / len(frames) for phase in PROFILE_PHASES}
+        return {'frames': len(frames), 'p50': percentile(50), 'p95': percentile(95),
+                'p99': percentile(99), 'phases': means}
+        
+    def draw(self, screen, font):
+        if not self.visible:
+            return
+        if self.overlay is None:
+            summary = self.summary()
+            if summary is None:
+                return
+            lines = [f"frame p50 {summary['p50']:.2f}  p95 {summary['p95']:.2f}  p99 {summary['p99']:.2f} ms"]
+            lines += [f"{phase:<14}{ms:6.2f} ms" for phase, ms in summary['phases'].items()]
+            line_height = font.get_linesize()
+            self.overlay = pygame.Surface((360, line_height * len(lines) + 12))
+            self.overlay.set_alpha(200)
+            # Rendered directly: these numbers never repeat, so caching them would only evict HUD text
+            for i, line in enumerate(lines):
+                self.overlay.blit(font.render(line, True, COLORS['white']), (6, 6 + i * line_height))
+        screen.blit(self.overlay, (10, 60))
+        
+    def dump_csv(self, path):
+        with open(path, 'w') as f:
+            f.write('frame,total,' + ','.join(PROFILE_PHASES) + '\n')
+            first = max(0, self.count - self.capacity)
+            for i, frame in enumerate(self.recent()):
+                values = [sum(frame.values())] + [frame[phase] for phase in PROFILE_PHASES]
+                f.write(f"{first + i}," + ','.join(f"{v:.3f}" for v in values) + '\n')
+        return path
+
+class TextCache:
+    """LRU cache of rendered text surfaces; they are shared, so callers must only blit them"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        
+    def render(self, font, text, antialias, color):
+        key = (font, text, antialias, tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+TEXT_CACHE = TextCache()
+
+def render_text(font, text, antialias, color):
+    return TEXT_CACHE.render(font, text, antialias, color)
+
+_fonts = {}
+
+def load_font(size):
+    # One Font object per size, so cached text keys stay stable
+    if size not in _fonts:
+        _fonts[size] = pygame.font.Font(None, size)
+    return _fonts[size]
+
+def draw_hud(screen, session, font, small_font):
+    pygame.draw.rect(screen, COLORS['bg_dark'], (0, 0, WIDTH, 50))
     
-    return platforms, obstacles, buildings, goal, level_end_x
+    lives_text = render_text(font, f"LIVES: {session.player.lives}", True, COLORS['white'])
+    screen.blit(lives_text, (20, 10))
+    
+    time_text = render_text(font, f"TIME: {session.display_time()}", True, COLORS['white'])
+    screen.blit(time_text, (WIDTH - 180, 10))
+    
+    level_text = render_text(small_font, session.hud_label(), True, COLORS['white'])
+    screen.blit(level_text, (WIDTH // 2 - 60, 15))
 
 def draw_loading_screen(screen, font, quote):
     screen.fill(COLORS['bg_dark'])
     
     dots = "." * ((pygame.time.get_ticks() // 500) % 4)
-    loading_text = font.render(f"LOADING{dots}", True, COLORS['white'])
+    loading_text = render_text(font, f"LOADING{dots}", True, COLORS['white'])
     screen.blit(loading_text, (WIDTH // 2 - loading_text.get_width() // 2, HEIGHT // 2 - 50))
     
-    quote_font = pygame.font.Font(None, 28)
-    quote_text = quote_font.render(quote, True, COLORS['gray'])
+    quote_font = load_font(28)
+    quote_text = render_text(quote_font, quote, True, COLORS['gray'])
     screen.blit(quote_text, (WIDTH // 2 - quote_text.get_width() // 2, HEIGHT // 2 + 50))
     
     bar_width = 400
@@ -830,31 +1795,39 @@ def draw_loading_screen(screen, font, quote):
     fill_width = int((pygame.time.get_ticks() % 2000) / 2000 * bar_width)
     pygame.draw.rect(screen, COLORS['green'], (bar_x, bar_y, fill_width, bar_height))
 
-def draw_title_screen(screen, font, large_font, start_button, quit_button, mouse_pos, title_image=None, sub_image=None):
-    for y in range(0, HEIGHT, 8):
-        darkness = int(15 + (y / HEIGHT) * 20)
-        pygame.draw.rect(screen, (darkness, darkness, darkness + 10), (0, y, WIDTH, 8))
+_gradients = {}
+
+def gradient_background(base, span):
+    if (base, span) not in _gradients:
+        surface = pygame.Surface((WIDTH, HEIGHT))
+        for y in range(0, HEIGHT, 8):
+            darkness = int(base + (y / HEIGHT) * span)
+            pygame.draw.rect(surface, (darkness, darkness, darkness + 10), (0, y, WIDTH, 8))
+        _gradients[(base, span)] = surface
+    return _gradients[(base, span)]
+
+def draw_title_screen(screen, font, large_font, buttons, title_image=None, sub_image=None):
+    screen.blit(gradient_background(15, 20), (0, 0))
     
     if title_image:
         title_rect = title_image.get_rect(center=(WIDTH // 2, 180))
         screen.blit(title_image, title_rect)
     else:
-        title = large_font.render("ENTROPY", True, COLORS['white'])
+        title = render_text(large_font, "ENTROPY", True, COLORS['white'])
         screen.blit(title, (WIDTH // 2 - title.get_width() // 2, 150))
         
     if sub_image:
         sub_rect = sub_image.get_rect(center=(WIDTH // 2, 255))
         screen.blit(sub_image, sub_rect)
     else:
-        subtitle = font.render("Nothing Lasts Forever", True, COLORS['gray'])
+        subtitle = render_text(font, "Nothing Lasts Forever", True, COLORS['gray'])
         screen.blit(subtitle, (WIDTH // 2 - subtitle.get_width() // 2, 280))
     
-    start_button.check_hover(mouse_pos)
-    quit_button.check_hover(mouse_pos)
-    
-    for button in [start_button, quit_button]:
+    for button in buttons:
         draw_8bit_button(screen, button, font)
-    
+
+def draw_title_noise(screen):
+    screen.blit(gradient_background(15, 20), TITLE_NOISE_RECT, TITLE_NOISE_RECT)
     for i in range(100):
         x = random.randint(0, WIDTH)
         y = random.randint(HEIGHT - 100, HEIGHT)
@@ -870,7 +1843,7 @@ def draw_8bit_button(screen, button, font):
     pygame.draw.rect(screen, bg_color, button.rect.inflate(-12, -12))
     
     text_color = (200, 255, 200) if button.hovered else (200, 200, 220)
-    text_surf = font.render(button.text, True, text_color)
+    text_surf = render_text(font, button.text, True, text_color)
     text_rect = text_surf.get_rect(center=button.rect.center)
     screen.blit(text_surf, text_rect)
 
@@ -903,40 +1876,184 @@ def calculate_stars(level_num, time_taken, deaths):
     else:
         return 0
 
-def save_progress(level_scores):
+def atomic_write(path, text):
+    """Replace path with text so that a crash leaves either the old or the new file"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+class SaveWriter:
+    """Writes files atomically on a worker thread, keeping only the latest queued content per path"""
+
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.lock = threading.Lock()
+        self.pending = {}
+        
+    def write(self, path, text):
+        with self.lock:
+            queued = path in self.pending
+            self.pending[path] = text
+        if not queued:
+            self.executor.submit(self.flush_path, path)
+            
+    def flush_path(self, path):
+        with self.lock:
+            text = self.pending.pop(path)
+        try:
+            atomic_write(path, text)
+        except OSError as e:
+            print(f"Error saving {path}: {e}")
+            
+    def run(self, func, *args):
+        # Runs after every write queued so far
+        self.executor.submit(func, *args)
+        
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+SAVE_WRITER = SaveWriter()
+
+def save_progress(level_scores, writer=SAVE_WRITER):
     save_data = {
-        'level_scores': level_scores,
-        'unlocked_levels': []
+        'version': SAVE_VERSION,
+        'level_scores': [{'level': level, 'stars': stars} for level, stars in sorted(level_scores.items())],
+        'unlocked_levels': [i for i in LEVEL_CONFIG if is_level_unlocked(i, level_scores)],
     }
-    
-    for i in range(1, 11):
-        if i == 1 or level_scores.get(i - 1, 0) > 0:
-            save_data['unlocked_levels'].append(i)
-    
-    try:
-        with open('entropy_save.txt', 'w') as f:
-            json.dump(save_data, f)
-    except Exception as e:
-        print(f"Error saving: {e}")
+    writer.write(SAVE_FILE, json.dumps(save_data))
 
-def load_progress():
-    if not os.path.exists('entropy_save.txt'):
+def load_progress(path=SAVE_FILE):
+    if not os.path.exists(path):
         return {}
     
     try:
-        with open('entropy_save.txt', 'r') as f:
+        with open(path, 'r') as f:
             content = f.read().strip()
-            if not content:  # Empty file
-                return {}
-            save_data = json.loads(content)
-            return save_data.get('level_scores', {})
-    except (json.JSONDecodeError, ValueError) as e:
+        if not content:  # Empty file
+            return {}
+        save_data = json.loads(content)
+        version = save_data.get('version', 1)
+        if version == 1:
+            return {int(level): int(stars) for level, stars in save_data.get('level_scores', {}).items()}
+        if version == SAVE_VERSION:
+            return {int(entry['level']): int(entry['stars']) for entry in save_data['level_scores']}
+        print(f"Save file version {version} is newer than this game, starting fresh")
+        return {}
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
         print(f"Save file corrupted, starting fresh: {e}")
         return {}
     except Exception as e:
         print(f"Error loading: {e}")
         return {}
 
+def encode_inputs(input_log):
+    # Run-length pairs: [inputs, count, inputs, count, ...]
+    runs = []
+    for inputs in input_log:
+        if runs and runs[-2] == inputs:
+            runs[-1] += 1
+        else:
+            runs.extend([inputs, 1])
+    return runs
+
+def decode_inputs(runs):
+    input_log = bytearray()
+    for i in range(0, len(runs), 2):
+        input_log.extend(bytes([runs[i]]) * runs[i + 1])
+    return input_log
+
+def replay_data(session):
+    return {
+        'version': REPLAY_VERSION,
+        'physics': PHYSICS_STAMP,
+        'level': session.level_num,
+        'seed': session.seed,
+        'ticks': session.ticks,
+        'inputs': encode_inputs(session.input_log),
+        'won': session.won,
+        'final_time': session.final_time,
+        'deaths': session.player.deaths,
+        'stars': session.stars,
+    }
+
+def save_replay(session, writer=SAVE_WRITER):
+    path = os.path.join(REPLAY_DIR, f"level{session.level_num}_{int(time.time() * 1000)}.json")
+    writer.write(path, json.dumps(replay_data(session), separators=(',', ':')))
+    writer.run(prune_replays, session.level_num)
+    return path
+
+def prune_replays(level_num, keep=MAX_REPLAYS_PER_LEVEL, directory=REPLAY_DIR):
+    """Delete all but the newest keep replays of a level"""
+    prefix = f"level{level_num}_"
+    try:
+        stamps = sorted(int(name[len(prefix):-5]) for name in os.listdir(directory)
+                        if name.startswith(prefix) and name.endswith('.json') and name[len(prefix):-5].isdigit())
+        for stamp in stamps[:-keep]:
+            os.remove(os.path.join(directory, f"{prefix}{stamp}.json"))
+    except OSError as e:
+        print(f"Error pruning replays: {e}")
+
+def load_replay(path):
+    with open(path, 'r') as f:
+        replay = json.load(f)
+    if replay.get('version') != REPLAY_VERSION:
+        raise ValueError(f"unsupported replay version {replay.get('version')}")
+    if replay.get('physics') != PHYSICS_STAMP:
+        raise ValueError(f"replay recorded with different physics ({replay.get('physics')})")
+    return replay
+
+def run_replay(replay):
+    """Re-simulate a recorded run as fast as possible, without drawing"""
+    session = new_session(replay['level'], seed=replay['seed'])
+    runs = replay['inputs']
+    for i in range(0, len(runs), 2):
+        session.step(runs[i], runs[i + 1])
+    return session
+
+def verify_replay(replay):
+    session = run_replay(replay)
+    mismatches = []
+    for key, actual in [('ticks', session.ticks), ('won', session.won),
+                        ('final_time', session.final_time), ('deaths', session.player.deaths),
+                        ('stars', calculate_stars(session.level_num, session.final_time, session.player.deaths)
+                         if session.won else 0)]:
+        if replay.get(key) != actual:
+            mismatches.append(f"{key}: recorded {replay.get(key)}, replayed {actual}")
+    return mismatches
+
+def verify_replays(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith('.json'))
+        else:
+            files.append(path)
+    
+    failures = 0
+    simulated_ticks = 0
+    start = time.perf_counter()
+    for path in files:
+        try:
+            replay = load_replay(path)
+            mismatches = verify_replay(replay)
+            simulated_ticks += replay['ticks']
+        except Exception as e:
+            mismatches = [f"error: {e}"]
+        if mismatches:
+            failures += 1
+            print(f"FAIL {path}: {'; '.join(mismatches)}")
+    elapsed = time.perf_counter() - start
+    
+    speedup = simulated_ticks * SIM_STEP_MS / 1000 / elapsed if elapsed > 0 else 0
+    print(f"Verified {len(files) - failures}/{len(files)} replays in {elapsed:.2f}s ({speedup:.0f}x real time)")
+    return failures == 0
+
 def is_level_unlocked(level_num, level_scores):
     if level_num == 1:
         return True
@@ -971,107 +2088,165 @@ def load_gif_frames(path, scale_size=(PLAYER_SIZE, PLAYER_SIZE)):
     
     return frames
 
-def main():
+def sprite_source_stamp(path):
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+def load_sprite_atlas(sprite_gifs=PLAYER_SPRITE_GIFS, scale_size=(PLAYER_SIZE, PLAYER_SIZE), cache_dir=CACHE_DIR):
+    """Return {key: [frames]} for the given GIFs, decoding them only on a cache miss"""
+    sources = {key: os.path.join(BASE_DIR, filename) for key, filename in sprite_gifs.items()}
+    sources = {key: path for key, path in sources.items() if os.path.exists(path)}
+    stamps = {key: sprite_source_stamp(path) for key, path in sources.items()}
+    atlas_path = os.path.join(cache_dir, 'sprites', 'atlas.png')
+    index_path = os.path.join(cache_dir, 'sprites', 'atlas.json')
+    
+    try:
+        with open(index_path, 'r') as f:
+            index = json.load(f)
+        if (index['version'] == SPRITE_ATLAS_VERSION and index['size'] == list(scale_size)
+                and index['sources'] == stamps):
+            atlas = pygame.image.load(atlas_path)
+            return {key: [atlas.subsurface(rect).copy() for rect in rects]
+                    for key, rects in index['frames'].items()}
+    except (OSError, ValueError, KeyError, pygame.error):
+        pass
+    
+    sprites = {key: load_gif_frames(path, scale_size) for key, path in sources.items()}
+    sprites = {key: frames for key, frames in sprites.items() if frames}
+    if not sprites:
+        return sprites
+    
+    frame_w, frame_h = scale_size
+    columns = max(len(frames) for frames in sprites.values())
+    atlas = pygame.Surface((columns * frame_w, len(sprites) * frame_h), pygame.SRCALPHA)
+    rects = {}
+    for row, (key, frames) in enumerate(sprites.items()):
+        rects[key] = []
+        for col, frame in enumerate(frames):
+            atlas.blit(frame, (col * frame_w, row * frame_h))
+            rects[key].append([col * frame_w, row * frame_h, frame_w, frame_h])
+    
+    try:
+        os.makedirs(os.path.dirname(atlas_path), exist_ok=True)
+        pygame.image.save(atlas, atlas_path)
+        with open(index_path, 'w') as f:
+            json.dump({'version': SPRITE_ATLAS_VERSION, 'size': list(scale_size),
+                       'sources': {key: stamps[key] for key in sprites}, 'frames': rects}, f)
+    except (OSError, pygame.error) as e:
+        print(f"Could not write sprite atlas: {e}")
+    return sprites
+
+def init_pygame():
+    # Only the subsystems the game uses; mixer and joystick stay off
+    pygame.display.init()
+    pygame.font.init()
+
+def asset_path(filename):
+    return os.path.join(BASE_DIR, 'graphics', filename)
+
+class StartupProfiler:
+    def __init__(self, start):
+        self.start = start
+        self.last = start
+        self.phases = []
+        
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+        
+    def report(self):
+        print("Startup time to first frame:")
+        for phase, seconds in self.phases:
+            print(f"  {phase:<16}{seconds * 1000:8.1f} ms")
+        print(f"  {'total':<16}{(self.last - self.start) * 1000:8.1f} ms")
+
+def main(profile_startup=False):
+    startup = StartupProfiler(IMPORT_START)
+    startup.mark("imports")
+    
+    init_pygame()
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Entropy - 8-bit Edition")
     clock = pygame.time.Clock()
+    clock.tick()  # Also starts SDL's timer, which pygame.time.get_ticks needs without pygame.init()
+    startup.mark("init")
     
-    font = pygame.font.Font(None, 36)
-    small_font = pygame.font.Font(None, 28)
-    large_font = pygame.font.Font(None, 96)
+    font = load_font(36)
+    small_font = load_font(28)
+    large_font = load_font(96)
+    startup.mark("fonts")
     
     # Load images
     title_image = None
     try:
-        for path in ['graphics/title.png', './graphics/title.png', 'title.png']:
-            if os.path.exists(path):
-                title_image = pygame.image.load(path).convert_alpha()
-                if title_image.get_width() > 600:
-                    scale_factor = 600 / title_image.get_width()
-                    new_height = int(title_image.get_height() * scale_factor)
-                    title_image = pygame.transform.scale(title_image, (600, new_height))
-                break
+        title_image = pygame.image.load(asset_path('title.png')).convert_alpha()
+        if title_image.get_width() > 600:
+            scale_factor = 600 / title_image.get_width()
+            new_height = int(title_image.get_height() * scale_factor)
+            title_image = pygame.transform.scale(title_image, (600, new_height))
     except Exception as e:
         print(f"Could not load title image: {e}")
+    startup.mark("title image")
 
     sub_image = None
     try:
-        for path in ['graphics/subtxt.png', './graphics/subtxt.png', 'subtxt.png']:
-            if os.path.exists(path):
-                sub_image = pygame.image.load(path).convert_alpha()
-                if sub_image.get_width() > 500:
-                    scale_factor = 500 / sub_image.get_width()
-                    new_height = int(sub_image.get_height() * scale_factor)
-                    sub_image = pygame.transform.scale(sub_image, (500, new_height))
-                break
+        sub_image = pygame.image.load(asset_path('subtxt.png')).convert_alpha()
+        if sub_image.get_width() > 500:
+            scale_factor = 500 / sub_image.get_width()
+            new_height = int(sub_image.get_height() * scale_factor)
+            sub_image = pygame.transform.scale(sub_image, (500, new_height))
     except Exception as e:
         print(f"Could not load subtitle image: {e}")
+    startup.mark("subtitle image")
 
     star_small = None
     star_large = None
     star_large_dim = None
     try:
-        for path in ['graphics/star.png', './graphics/star.png', 'star.png']:
-            if os.path.exists(path):
-                star_image = pygame.image.load(path).convert_alpha()
-                star_small = pygame.transform.scale(star_image, (16, 16))
-                star_large = pygame.transform.scale(star_image, (40, 40))
-                star_large_dim = star_large.copy()
-                star_large_dim.fill((120, 120, 120, 255), special_flags=pygame.BLEND_RGBA_MULT)
-                break
+        star_image = pygame.image.load(asset_path('star.png')).convert_alpha()
+        star_small = pygame.transform.scale(star_image, (16, 16))
+        star_large = pygame.transform.scale(star_image, (40, 40))
+        star_large_dim = star_large.copy()
+        star_large_dim.fill((120, 120, 120, 255), special_flags=pygame.BLEND_RGBA_MULT)
     except Exception as e:
         print(f"Could not load star image: {e}")
+    startup.mark("star images")
 
     player_sprites = {}
     try:
-        sprite_gifs = {
-            "stand_left": "graphics/oldManStandLeft.gif",
-            "stand_right": "graphics/oldManStandRight.gif",
-            "walk_left": "graphics/oldManWalkLeft.gif",
-            "walk_right": "graphics/oldManWalkRight.gif",
-        }
-        
-        for key, filename in sprite_gifs.items():
-            for path in [filename, f'./{filename}']:
-                if os.path.exists(path):
-                    frames = load_gif_frames(path, (PLAYER_SIZE, PLAYER_SIZE))
-                    if frames:
-                        for i, frame in enumerate(frames):
-                            player_sprites[f"{key}_{i}"] = frame
-                        if frames:
-                            player_sprites[key] = frames[0]
-                    break
+        # Convert once here so blits in Player.draw skip per-pixel format conversion
+        player_sprites = {key: [frame.convert_alpha() for frame in frames]
+                          for key, frames in load_sprite_atlas().items()}
     except Exception as e:
         print(f"Could not load player sprites: {e}")
         player_sprites = {}
+    startup.mark("sprites")
     
     state = TITLE
     current_level = 1
-    camera = Camera()
-    player = None
-    platforms = []
-    obstacles = []
-    buildings = []
-    goal = None
-    death_chunks = []
-    
-    start_time = 0
-    final_time = 0
-    game_over = False
-    won = False
+    session = None
+    accumulator = 0
+    pending_jump = False
+    level_loader = LevelLoader(player_sprites)
+    loading_future = None
     loading_start = 0
     loading_quote = random.choice(LOADING_QUOTES)
     
     level_scores = load_progress()
+    startup.mark("save data")
     
-    start_button = Button(WIDTH // 2 - 150, 380, 300, 70, "START GAME", "start")
-    quit_button = Button(WIDTH // 2 - 150, 480, 300, 70, "QUIT", "quit")
+    start_button = Button(WIDTH // 2 - 150, 350, 300, 70, "START GAME", "start")
+    endless_button = Button(WIDTH // 2 - 150, 440, 300, 70, "ENDLESS", "endless")
+    quit_button = Button(WIDTH // 2 - 150, 530, 300, 70, "QUIT", "quit")
+    title_buttons = [start_button, endless_button, quit_button]
     replay_button = Button(WIDTH // 2 - 170, HEIGHT // 2 + 140, 340, 60, "REPLAY LEVEL", "replay")
     levels_button = Button(WIDTH // 2 - 170, HEIGHT // 2 + 210, 340, 60, "BACK TO LEVELS", "levels")
     
     def create_level_buttons():
         buttons = []
-        for i in range(1, 11):
+        # The grid has room for the first ten levels of the pack
+        for i in sorted(LEVEL_CONFIG)[:10]:
             local_idx = i - 1
             row = local_idx // 5
             col = local_idx % 5
@@ -1086,19 +2261,35 @@ def main():
     back_arrow = ArrowButton(50, HEIGHT // 2 - 40, 'left')
     mouse_pos = (0, 0)
     
+    # Menus redraw fully only when this changes; otherwise just their animated parts
+    # and the buttons whose hover state differs from menu_hover
+    menu_signature = None
+    menu_hover = None
+    frame_rate = FPS
+    profiler = FrameProfiler()
+    
     running = True
     while running:
-        dt = clock.tick(FPS)
+        dt = clock.tick(frame_rate)
         mouse_pos = pygame.mouse.get_pos()
         
-        for event in pygame.event.get():
+        events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                menu_signature = None
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:
                     if state == TITLE:
                         if start_button.check_click(mouse_pos):
                             state = LEVEL_SELECT
+                        elif endless_button.check_click(mouse_pos):
+                            current_level = ENDLESS_LEVEL
+                            loading_future = level_loader.take(current_level)
+                            state = LOADING
+                            loading_start = pygame.time.get_ticks()
+                            loading_quote = random.choice(LOADING_QUOTES)
                         elif quit_button.check_click(mouse_pos):
                             running = False
                             
@@ -1109,210 +2300,224 @@ def main():
                             for btn in level_buttons:
                                 if btn.check_click(mouse_pos):
                                     current_level = btn.level_num
+                                    loading_future = level_loader.take(current_level)
                                     state = LOADING
                                     loading_start = pygame.time.get_ticks()
                                     loading_quote = random.choice(LOADING_QUOTES)
                                     break
                     elif state == GAME_OVER:
                         if replay_button.check_click(mouse_pos):
-                            player = Player(50, HEIGHT - 100, player_sprites)
-                            platforms, obstacles, buildings, goal, level_end_x = create_level(current_level)
-                            camera = Camera()
-                            death_chunks = []
-                            start_time = pygame.time.get_ticks()
-                            final_time = 0
-                            game_over = False
-                            won = False
-                            player.max_x = level_end_x
-                            state = PLAYING
+                            loading_future = level_loader.take(current_level)
+                            if loading_future.done():
+                                session = loading_future.result()
+                                accumulator = 0
+                                pending_jump = False
+                                state = PLAYING
+                            else:
+                                state = LOADING
+                                loading_start = pygame.time.get_ticks() - LOADING_MIN_DISPLAY_MS
                         elif levels_button.check_click(mouse_pos):
                             level_buttons = create_level_buttons()
                             state = LEVEL_SELECT
                                     
             elif event.type == pygame.KEYDOWN:
-                if state == PLAYING and not game_over:
+                if event.key == pygame.K_F3:
+                    profiler.visible = not profiler.visible
+                elif event.key == pygame.K_F4:
+                    try:
+                        print(f"Frame profile written to {profiler.dump_csv(f'frame_profile_{int(time.time())}.csv')}")
+                    except OSError as e:
+                        print(f"Error writing frame profile: {e}")
+                if state == PLAYING and not session.game_over:
                     if event.key == pygame.K_SPACE or event.key == pygame.K_UP or event.key == pygame.K_w:
-                        player.jump()
+                        pending_jump = True
+        
+        # None repaints the whole window; menus fill in just their changed rects
+        dirty_rects = None
+        signature = None
+        hover = None
         
         if state == TITLE:
-            draw_title_screen(screen, font, large_font, start_button, quit_button, mouse_pos, title_image, sub_image)
+            for button in title_buttons:
+                button.check_hover(mouse_pos)
+            signature = TITLE
+            hover = tuple(button.hovered for button in title_buttons)
+            dirty_rects = []
+            if signature == menu_signature:
+                for button, was_hovered in zip(title_buttons, menu_hover):
+                    if button.hovered != was_hovered:
+                        draw_8bit_button(screen, button, font)
+                        dirty_rects.append(button.rect)
+            else:
+                draw_title_screen(screen, font, large_font, title_buttons, title_image, sub_image)
+                dirty_rects.append(screen.get_rect())
+            draw_title_noise(screen)
+            dirty_rects.append(TITLE_NOISE_RECT)
             
         elif state == LOADING:
             draw_loading_screen(screen, font, loading_quote)
             
-            if pygame.time.get_ticks() - loading_start > 2000:
-                player = Player(50, HEIGHT - 100, player_sprites)
-                platforms, obstacles, buildings, goal, level_end_x = create_level(current_level)
-                camera = Camera()
-                death_chunks = []
-                start_time = pygame.time.get_ticks()
-                final_time = 0
-                game_over = False
-                won = False
-                player.max_x = level_end_x
+            if loading_future.done() and pygame.time.get_ticks() - loading_start >= LOADING_MIN_DISPLAY_MS:
+                session = loading_future.result()
+                accumulator = 0
+                pending_jump = False
                 state = PLAYING
             
         elif state == LEVEL_SELECT:
-            for y in range(0, HEIGHT, 8):
-                darkness = int(20 + (y / HEIGHT) * 15)
-                pygame.draw.rect(screen, (darkness, darkness, darkness + 10), (0, y, WIDTH, 8))
-            
-            title = large_font.render("LEVEL SELECT", True, COLORS['white'])
-            screen.blit(title, (WIDTH // 2 - title.get_width() // 2, 40))
-            
             for btn in level_buttons:
-                btn.check_hover(mouse_pos)
-                btn.draw(screen, font, star_small)
-            
+                if btn.check_hover(mouse_pos):
+                    level_loader.prefetch(btn.level_num)
             back_arrow.check_hover(mouse_pos)
-            back_arrow.draw(screen)
-            
-        elif state == PLAYING:
-            if not game_over:
-                player.update([p.data for p in platforms])
-                camera.update(player)
-                
-                elapsed_time = (pygame.time.get_ticks() - start_time) / 1000
-                config = LEVEL_CONFIG[current_level]
-                time_remaining = max(0, config['time'] - elapsed_time)
-                
-                distance_decay = min(1.0, player.furthest_x / config['distance'])
-                decay_factor = distance_decay
-                glitch_intensity = distance_decay
-                
-                if time_remaining <= 15:
-                    static_intensity = (15 - time_remaining) / 15.0
-                else:
-                    static_intensity = 0
+            signature = (LEVEL_SELECT, id(level_buttons))
+            hover = (back_arrow.hovered,) + tuple(btn.hovered for btn in level_buttons)
+            dirty_rects = []
+            if signature == menu_signature:
+                for btn, was_hovered in zip([back_arrow] + level_buttons, menu_hover):
+                    if btn.hovered != was_hovered:
+                        screen.blit(gradient_background(20, 15), btn.rect, btn.rect)
+                        if btn is back_arrow:
+                            btn.draw(screen)
+                        else:
+                            btn.draw(screen, font, star_small)
+                        dirty_rects.append(btn.rect)
+            else:
+                screen.blit(gradient_background(20, 15), (0, 0))
                 
-                for obstacle in obstacles:
-                    if obstacle.check_collision(player):
-                        player.lives -= 1
-                        player.deaths += 1
-                        
-                        num_chunks = random.randint(2, 3)
-                        for _ in range(num_chunks):
-                            chunk_width = random.randint(100, 180)
-                            chunk_height = random.randint(80, 140)
-                            chunk_x = random.randint(0, WIDTH - chunk_width)
-                            chunk_y = random.randint(0, HEIGHT - chunk_height)
-                            death_chunks.append(DeathChunk(chunk_x, chunk_y, chunk_width, chunk_height))
-                        
-                        player.reset()
-                        
-                        if player.lives <= 0:
-                            game_over = True
-                            final_time = int(elapsed_time)
-                            state = GAME_OVER
+                title = render_text(large_font, "LEVEL SELECT", True, COLORS['white'])
+                screen.blit(title, (WIDTH // 2 - title.get_width() // 2, 40))
                 
-                if goal.check_collision(player):
-                    won = True
-                    game_over = True
-                    final_time = int(elapsed_time)
-                    stars = calculate_stars(current_level, final_time, player.deaths)
-                    level_scores[current_level] = max(level_scores.get(current_level, 0), stars)
-                    save_progress(level_scores)
-                    state = GAME_OVER
+                for btn in level_buttons:
+                    btn.draw(screen, font, star_small)
                 
-                if time_remaining <= 0:
-                    game_over = True
-                    final_time = config['time']
-                    state = GAME_OVER
-            
-            # Draw with parallax
-            sky_intensity = int(228 * (1 - decay_factor * 0.8))
-            sky_color = (int(95 * (1 - decay_factor * 0.5)), 
-                        int(205 * (1 - decay_factor * 0.6)), 
-                        sky_intensity)
-            screen.fill(sky_color)
-            
-            # Draw buildings (parallax background)
-            for building in buildings:
-                building.draw(screen, camera, decay_factor, glitch_intensity)
-            
-            for platform in platforms:
-                platform.draw(screen, camera, decay_factor, glitch_intensity)
-            
-            for obstacle in obstacles:
-                obstacle.draw(screen, camera, decay_factor, glitch_intensity)
-            
-            goal.draw(screen, camera, decay_factor)
-            player.draw(screen, camera, decay_factor)
+                back_arrow.draw(screen)
+                dirty_rects.append(screen.get_rect())
             
-            for chunk in death_chunks:
-                chunk.draw(screen)
-            
-            if static_intensity > 0:
-                draw_8bit_static(screen, static_intensity, 8)
-            
-            pygame.draw.rect(screen, COLORS['bg_dark'], (0, 0, WIDTH, 50))
-            
-            lives_text = font.render(f"LIVES: {player.lives}", True, COLORS['white'])
-            screen.blit(lives_text, (20, 10))
+        elif state == PLAYING:
+            profiler.begin_frame()
+            accumulator += min(dt, MAX_FRAME_MS)
+            while accumulator >= SIM_STEP_MS and not session.game_over:
+                accumulator -= SIM_STEP_MS
+                inputs = read_keyboard_inputs()
+                if pending_jump:
+                    inputs |= INPUT_JUMP
+                    pending_jump = False
+                session.step(inputs)
             
-            config = LEVEL_CONFIG[current_level]
+            if session.game_over:
+                if session.won:
+                    level_scores[current_level] = max(level_scores.get(current_level, 0), session.stars)
+                    save_progress(level_scores)
+                save_replay(session)
+                level_loader.prefetch(current_level)
+                state = GAME_OVER
+            profiler.mark('physics')
             
-            if game_over:
-                display_time = final_time
-            else:
-                display_time = int(max(0, config['time'] - (pygame.time.get_ticks() - start_time) / 1000))
+            session.stream()
+            profiler.mark('stream')
             
-            time_text = font.render(f"TIME: {display_time}", True, COLORS['white'])
-            screen.blit(time_text, (WIDTH - 180, 10))
+            # Draw between the last two ticks so motion stays smooth at any frame rate
+            session.draw(screen, accumulator / SIM_STEP_MS, profiler, dt)
             
-            level_text = small_font.render(f"LEVEL {current_level}", True, COLORS['white'])
-            screen.blit(level_text, (WIDTH // 2 - 60, 15))
+            draw_hud(screen, session, font, small_font)
+            profiler.draw(screen, load_font(22))
+            profiler.mark('hud')
             
         elif state == GAME_OVER:
-            screen.fill(COLORS['bg_dark'])
+            replay_button.check_hover(mouse_pos)
+            levels_button.check_hover(mouse_pos)
+            signature = (GAME_OVER, id(session))
+            hover = (replay_button.hovered, levels_button.hovered)
+            dirty_rects = []
+            if signature == menu_signature:
+                for button, was_hovered in zip([replay_button, levels_button], menu_hover):
+                    if button.hovered != was_hovered:
+                        draw_8bit_button(screen, button, font)
+                        dirty_rects.append(button.rect)
+            else:
+                screen.fill(COLORS['bg_dark'])
             
-            if won:
-                title = large_font.render("COMPLETE!", True, COLORS['green'])
+                if session.won:
+                    title = render_text(large_font, "COMPLETE!", True, COLORS['green'])
                 
-                stars = level_scores.get(current_level, 0)
+                    stars = level_scores.get(current_level, 0)
                 
-                stars_y = HEIGHT // 2 - 60
-                if star_large and star_large_dim:
-                    star_size = star_large.get_width()
-                    star_spacing = star_size + 20
-                    total_width = 3 * star_spacing - 20
-                    start_x = WIDTH // 2 - total_width // 2
-                    for i in range(3):
-                        star_x = start_x + i * star_spacing
-                        star_y_offset = -8 if i == 1 else 0
-                        star_image = star_large if i < stars else star_large_dim
-                        screen.blit(star_image, (star_x, stars_y + star_y_offset))
-                else:
-                    star_spacing = 60
-                    start_x = WIDTH // 2 - (3 * star_spacing) // 2
-                    for i in range(3):
-                        star_x = start_x + i * star_spacing
-                        star_y_offset = -8 if i == 1 else 0
-                        color = COLORS['gold'] if i < stars else COLORS['dark_gray']
-                        pygame.draw.rect(screen, color, (star_x + 16, stars_y + star_y_offset, 8, 24))
-                        pygame.draw.rect(screen, color, (star_x, stars_y + 8 + star_y_offset, 40, 8))
+                    stars_y = HEIGHT // 2 - 60
+                    if star_large and star_large_dim:
+                        star_size = star_large.get_width()
+                        star_spacing = star_size + 20
+                        total_width = 3 * star_spacing - 20
+                        start_x = WIDTH // 2 - total_width // 2
+                        for i in range(3):
+                            star_x = start_x + i * star_spacing
+                            star_y_offset = -8 if i == 1 else 0
+                            star_image = star_large if i < stars else star_large_dim
+                            screen.blit(star_image, (star_x, stars_y + star_y_offset))
+                    else:
+                        star_spacing = 60
+                        start_x = WIDTH // 2 - (3 * star_spacing) // 2
+                        for i in range(3):
+                            star_x = start_x + i * star_spacing
+                            star_y_offset = -8 if i == 1 else 0
+                            color = COLORS['gold'] if i < stars else COLORS['dark_gray']
+                            pygame.draw.rect(screen, color, (star_x + 16, stars_y + star_y_offset, 8, 24))
+                            pygame.draw.rect(screen, color, (star_x, stars_y + 8 + star_y_offset, 40, 8))
                 
-                time_text = font.render(f"Time: {final_time}s", True, COLORS['white'])
-                screen.blit(time_text, (WIDTH // 2 - time_text.get_width() // 2, HEIGHT // 2 + 50))
+                    time_text = render_text(font, f"Time: {session.final_time}s", True, COLORS['white'])
+                    screen.blit(time_text, (WIDTH // 2 - time_text.get_width() // 2, HEIGHT // 2 + 50))
                 
-                deaths_text = font.render(f"Deaths: {player.deaths}", True, COLORS['white'])
-                screen.blit(deaths_text, (WIDTH // 2 - deaths_text.get_width() // 2, HEIGHT // 2 + 90))
+                    deaths_text = render_text(font, f"Deaths: {session.player.deaths}", True, COLORS['white'])
+                    screen.blit(deaths_text, (WIDTH // 2 - deaths_text.get_width() // 2, HEIGHT // 2 + 90))
                 
-            elif player.lives <= 0:
-                title = large_font.render("DISSOLVED", True, COLORS['red'])
-            else:
-                title = large_font.render("TIME ENDED", True, COLORS['gray'])
+                elif session.player.lives <= 0:
+                    title = render_text(large_font, "DISSOLVED", True, COLORS['red'])
+                    
+                    if session.level_num == ENDLESS_LEVEL:
+                        distance_text = render_text(font, f"Distance: {session.distance()}m in {session.final_time}s",
+                                                    True, COLORS['white'])
+                        screen.blit(distance_text, (WIDTH // 2 - distance_text.get_width() // 2, HEIGHT // 2 + 50))
+                else:
+                    title = render_text(large_font, "TIME ENDED", True, COLORS['gray'])
             
-            screen.blit(title, (WIDTH // 2 - title.get_width() // 2, HEIGHT // 2 - 150))
+                screen.blit(title, (WIDTH // 2 - title.get_width() // 2, HEIGHT // 2 - 150))
             
-            replay_button.check_hover(mouse_pos)
-            levels_button.check_hover(mouse_pos)
-            draw_8bit_button(screen, replay_button, font)
-            draw_8bit_button(screen, levels_button, font)
+                draw_8bit_button(screen, replay_button, font)
+                draw_8bit_button(screen, levels_button, font)
+                dirty_rects.append(screen.get_rect())
         
-        pygame.display.flip()
+        if dirty_rects is None:
+            pygame.display.flip()
+            profiler.mark('flip')
+            profiler.end_frame()
+            frame_rate = FPS
+        else:
+            pygame.display.update(dirty_rects)
+            # Nothing moved and nothing changed: let the menu idle
+            frame_rate = FPS if events or signature != menu_signature or hover != menu_hover else MENU_IDLE_FPS
+        menu_signature = signature
+        menu_hover = hover
+        
+        if startup is not None:
+            startup.mark("first frame")
+            if profile_startup:
+                startup.report()
+            startup = None
     
+    level_loader.shutdown()
+    SAVE_WRITER.shutdown()
     pygame.quit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Entropy - 8-bit Edition")
+    modes = parser.add_mutually_exclusive_group()
+    modes.add_argument('--verify-replays', nargs='*', metavar='PATH',
+                       help=f're-simulate replay files or directories and check their outcomes (default: {REPLAY_DIR})')
+    modes.add_argument('--check-levels', nargs='?', type=int, const=1000, metavar='CHUNKS',
+                       help='report unreachable platforms in the level pack and CHUNKS endless chunks (default: 1000)')
+    parser.add_argument('--profile-startup', action='store_true', help='print how long each startup step took')
+    args = parser.parse_args()
+    
+    if args.verify_replays is not None:
+        sys.exit(0 if verify_replays(args.verify_replays or [REPLAY_DIR]) else 1)
+    if args.check_levels is not None:
+        sys.exit(0 if check_levels(args.check_levels) else 1)
+    main(profile_startup=args.profile_startup)